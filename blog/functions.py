@@ -0,0 +1,25 @@
+# blog/functions.py
+
+from django.db import models
+from django.db.models import Func, Value
+from django.db.models.functions import Left, Trim
+
+
+class RegexpReplace(Func):
+    """PostgreSQL REGEXP_REPLACE(source, pattern, replacement, flags)"""
+
+    function = "REGEXP_REPLACE"
+    output_field = models.TextField()
+
+    def __init__(self, expression, pattern: str, replacement: str, flags: str = "g"):
+        super().__init__(expression, Value(pattern), Value(replacement), Value(flags))
+
+
+def get_excerpt_expression(expression, length: int) -> Func:
+    """연속된 공백/줄바꿈을 공백 하나로 바꾸고 앞뒤 공백을 제거한 뒤, 앞부분 length 글자를 반환하는 표현식
+
+    저장(save/bulk_create), 일괄 갱신(PostQuerySet.update_excerpt), 마이그레이션에서 모두 이 표현식을 사용하여
+    요약 규칙이 어긋나지 않도록 합니다. expression 에는 F("content") 혹은 Value(content) 를 지정합니다.
+    """
+
+    return Left(Trim(RegexpReplace(expression, r"\s+", " ")), length)
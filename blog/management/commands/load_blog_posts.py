@@ -1,12 +1,15 @@
 # blog/management/commands/load_blog_posts.py
 
 
+from array import array
+from itertools import islice
 from random import choice
 import requests
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.db import reset_queries
 
 from accounts.models import User
-from blog.models import Category, Post, Tag, Comment
+from blog.models import Category, Post, PostTagRelation, Tag, Comment
 
 
 SAMPLE_POSTS_JSON_URL = (
@@ -27,6 +30,12 @@ class Command(BaseCommand):
         parser.add_argument(
             "comments_txt_url", nargs="?", default=SAMPLE_COMMENTS_TXT_URL
         )
+        parser.add_argument(
+            "--comments-multiplier",
+            type=int,
+            default=3,
+            help="샘플 댓글을 지정 배수만큼 반복하여 생성합니다. (디폴트: 3)",
+        )
         parser.add_argument(
             "--clear",
             action="store_true",
@@ -34,6 +43,9 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        if options["comments_multiplier"] < 1:
+            raise CommandError("--comments-multiplier 는 1 이상이어야 합니다.")
+
         posts_json_url = options["posts_json_url"]
         comments_txt_url = options["comments_txt_url"]
 
@@ -55,7 +67,7 @@ class Command(BaseCommand):
         create_categories(orig_post_list)
         create_tags(orig_post_list)
         create_posts(orig_post_list)
-        create_comments(orig_comments_txt)
+        create_comments(orig_comments_txt, multiplier=options["comments_multiplier"])
 
 
 def clear_data():
@@ -119,35 +131,69 @@ def create_posts(orig_post_list):
             content=orig_post["content"],
         )
         post._tag_list = orig_post["tag_list"]
-        post.slugify()
         post_list.append(post)
 
     if post_list:
         print(f"{len(post_list)} 개의 포스팅 생성")
         Post.objects.bulk_create(post_list, batch_size=1000)
 
-        for post in post_list:
-            _tag_list = [tag_dict[tag_name] for tag_name in post._tag_list]
-            post.tag_set.add(*_tag_list)
+        tag_id_dict = {tag_name: tag.pk for tag_name, tag in tag_dict.items()}
+        create_post_tag_relations(post_list, tag_id_dict)
 
 
-def create_comments(orig_comments_txt):
-    user_list = list(User.objects.all())
-    post_list = list(Post.objects.all())
-
-    # 데이터 3배 뻥튀기
-    lines = (
-        orig_comments_txt + "\n" + orig_comments_txt + "\n" + orig_comments_txt
-    ).splitlines()
-
-    comment_list = []
-    for message in lines:
-        if message := message.strip():
-            comment = Comment(
-                author=choice(user_list), post=choice(post_list), message=message
-            )
-            comment_list.append(comment)
-
-    if comment_list:
-        print(f"{len(comment_list)} 개의 댓글 생성")
-        Comment.objects.bulk_create(comment_list, batch_size=1000)
+def create_post_tag_relations(post_list, tag_id_dict, batch_size=1000):
+    """포스팅 별 post.tag_set.add() 대신, 모든 포스팅의 태그 관계를 한 번에 추가합니다."""
+
+    relation_list = [
+        PostTagRelation(post_id=post.pk, tag_id=tag_id_dict[tag_name])
+        # 같은 태그가 중복 지정된 경우를 제외합니다.
+        for post in post_list
+        for tag_name in dict.fromkeys(post._tag_list)
+    ]
+
+    if relation_list:
+        print(f"{len(relation_list)} 개의 포스팅-태그 관계 생성")
+        # 이미 있는 관계는 blog_post_tag_relation_unique 제약에 따라 무시합니다.
+        PostTagRelation.objects.bulk_create(
+            relation_list, batch_size=batch_size, ignore_conflicts=True
+        )
+
+
+def create_comments(orig_comments_txt, multiplier=3, batch_size=1000):
+    """댓글 생성
+
+    작성자/포스팅은 id 배열로만 조회하고, 댓글은 batch_size 개씩 생성하여 저장하므로
+    multiplier 를 키워도 메모리 사용량은 배치 크기만큼으로 유지됩니다.
+    """
+
+    # 모델 인스턴스 대신 정수 배열로 보관합니다. (레코드 당 8 바이트)
+    author_id_array = array("q", User.objects.values_list("id", flat=True).iterator())
+    post_id_array = array("q", Post.objects.values_list("id", flat=True).iterator())
+    if not author_id_array or not post_id_array:
+        print("사용자나 포스팅이 없어 댓글을 생성하지 않습니다.")
+        return
+
+    message_list = [
+        message for line in orig_comments_txt.splitlines() if (message := line.strip())
+    ]
+
+    def generate_comments():
+        # 원본 댓글을 multiplier 배로 뻥튀기
+        for __ in range(multiplier):
+            for message in message_list:
+                yield Comment(
+                    author_id=choice(author_id_array),
+                    post_id=choice(post_id_array),
+                    message=message,
+                )
+
+    comment_iter = generate_comments()
+    created_count = 0
+    while comment_list := list(islice(comment_iter, batch_size)):
+        Comment.objects.bulk_create(comment_list)
+        created_count += len(comment_list)
+        # DEBUG 모드에서 쌓이는 쿼리 로그(배치 별 INSERT 문)도 비워서, 메모리를 유지합니다.
+        reset_queries()
+
+    if created_count:
+        print(f"{created_count} 개의 댓글 생성")
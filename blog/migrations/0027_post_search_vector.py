@@ -0,0 +1,41 @@
+# Generated by Django 4.2.13 on 2026-10-18 06:07
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def update_search_vector(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+
+    Post.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A", config="simple")
+            + SearchVector("content", weight="B", config="simple")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0026_memogroup_remove_memo_author_memo_group"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="blog_post_search_idx"
+            ),
+        ),
+        migrations.RunPython(update_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.13 on 2026-10-18 06:08
+
+from django.db import migrations, models
+from django.db.models import F
+
+from blog.functions import get_excerpt_expression
+
+
+def update_excerpt(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Post.objects.update(excerpt=get_excerpt_expression(F("content"), 200))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0027_post_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="content 필드로 부터 자동생성합니다.",
+                max_length=200,
+            ),
+        ),
+        migrations.RunPython(update_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.13 on 2026-10-18 06:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0028_post_excerpt"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="post",
+            name="unique_slug",
+        ),
+        migrations.AddConstraint(
+            model_name="post",
+            constraint=models.UniqueConstraint(fields=("slug",), name="unique_slug"),
+        ),
+    ]
@@ -1,17 +1,45 @@
+import re
+from typing import Iterable
 from uuid import uuid4
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    CombinedSearchVector,
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
-from django.db.models import UniqueConstraint, Q
-from django.db.models.functions import Lower
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Case,
+    Exists,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    UniqueConstraint,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Lower
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
 from django.utils.text import slugify
-from django_lifecycle import LifecycleModelMixin, hook, BEFORE_UPDATE, AFTER_UPDATE
-
+from django_lifecycle import (
+    LifecycleModelMixin,
+    hook,
+    AFTER_UPDATE,
+    BEFORE_CREATE,
+    BEFORE_UPDATE,
+)
+
+from blog.functions import get_excerpt_expression
 from core.model_field import IPv4AddressIntegerField, BooleanYNField
 
 
@@ -30,20 +58,185 @@ class Category(models.Model):
         return self.name
 
 
+# ts_headline 결과를 HTML 이스케이프한 뒤에 <mark> 태그로 바꾸기 위한 구분 문자
+HEADLINE_START_SEL = "\x02"
+HEADLINE_STOP_SEL = "\x03"
+
+
+# 제목으로 만든 slug 뒤에 붙이는 임의 문자열의 길이
+POST_SLUG_SUFFIX_LENGTH = 8
+
+# slug 충돌 시 다시 생성하는 최대 횟수
+POST_SLUG_MAX_TRIES = 5
+
+# 목록에서 내용 대신 보여줄 요약의 최대 길이
+POST_EXCERPT_LENGTH = 200
+
+
+def make_post_slug(title: str, max_length: int) -> str:
+    """제목으로 만든 slug 문자열 뒤에 uuid 일부를 붙여, slug의 유일성을 확보합니다."""
+
+    suffix = "-" + uuid4().hex[:POST_SLUG_SUFFIX_LENGTH]
+    return slugify(title, allow_unicode=True)[: max_length - len(suffix)] + suffix
+
+
+def headline_to_html(headline: str) -> SafeString:
+    """ts_headline 결과를 이스케이프하고, 검색어 강조 구간을 <mark> 태그로 감쌉니다."""
+
+    html = escape(headline)
+    html = html.replace(HEADLINE_START_SEL, "<mark>")
+    html = html.replace(HEADLINE_STOP_SEL, "</mark>")
+    return mark_safe(html)
+
+
 class PostQuerySet(models.QuerySet):
+    # 한글 형태소 분석기가 없으므로, 공백 단위로 토큰을 나누는 simple 설정을 사용합니다.
+    search_config = "simple"
+
+    # 태그명이 검색어와 일치할 때, 검색 순위에 더하는 점수
+    search_tag_rank_bonus = 1.0
+
     def published(self):
         return self.filter(status=Post.Status.PUBLISHED)
 
     def draft(self):
         return self.filter(status=Post.Status.DRAFT)
 
+    def get_search_query(self, query: str):
+        """검색어를 접두어 검색 tsquery로 변환합니다. 검색할 단어가 없으면 None을 반환합니다."""
+
+        # tsquery 문법에 쓰이는 특수문자(&, |, !, :, 괄호 등)를 제거하고 단어만 남깁니다.
+        word_list = re.findall(r"\w+", query)
+        if not word_list:
+            return None
+
+        raw_query = " & ".join(f"{word}:*" for word in word_list)
+        return SearchQuery(raw_query, config=self.search_config, search_type="raw")
+
     def search(self, query: str):
-        return self.filter(title__contains=query)
+        """제목(A)/내용(B) 전문 검색과 태그명 일치 검색 (검색 순위 순)
+
+        태그명은 blog_tag_name_unique 인덱스를 타도록 Lower(name) 으로 비교합니다.
+        상관 서브쿼리(EXISTS)와 OR로 묶으면 search_vector 의 GIN 인덱스를 사용하지 못하므로,
+        전문 검색(GIN 인덱스)과 태그 검색(post/tag 인덱스)의 포스팅 id를 UNION 하여 pk IN 서브쿼리로 조회합니다.
+        태그 포스팅 id 목록을 파이썬으로 가져오지 않으므로, 포스팅이 많은 태그도 쿼리 크기가 늘지 않습니다.
+        """
+
+        query = query.strip()
+        if not query:
+            return self.none()
+
+        tag_post_relation_qs = PostTagRelation.objects.filter(
+            tag__in=Tag.objects.annotate(lower_name=Lower("name"))
+            .filter(lower_name=query.lower())
+            .values("pk")
+        )
+
+        search_query = self.get_search_query(query)
+        if search_query is None:
+            return (
+                self.filter(pk__in=tag_post_relation_qs.values("post_id"))
+                .annotate(search_rank=Value(self.search_tag_rank_bonus, FloatField()))
+                .order_by("-search_rank", "-id")
+            )
+
+        matched_post_id_qs = (
+            self.model.objects.filter(search_vector=search_query)
+            .order_by()
+            .values("pk")
+            .union(tag_post_relation_qs.order_by().values("post_id"))
+        )
+
+        # 태그 일치 여부는 조회된 포스팅에 대해서만, post/tag 유일 인덱스로 확인합니다.
+        # ts_rank의 real 타입 값은 커서 페이지네이션 비교 시에 오차가 생기므로, double로 변환합니다.
+        search_rank = Cast(
+            SearchRank(F("search_vector"), search_query), FloatField()
+        ) + Case(
+            When(
+                Exists(tag_post_relation_qs.filter(post=OuterRef("pk"))),
+                then=Value(self.search_tag_rank_bonus),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+
+        return (
+            self.filter(pk__in=matched_post_id_qs)
+            .annotate(search_rank=search_rank)
+            .order_by("-search_rank", "-id")
+        )
+
+    def with_headline(self, query: str):
+        """검색어가 포함된 제목/내용 일부를 title_headline, content_headline 으로 조회합니다.
+
+        ts_headline은 비용이 크므로, 페이지 단위로 잘라낸 쿼리셋에만 사용해주세요.
+        """
+
+        search_query = self.get_search_query(query)
+        if search_query is None:
+            return self.annotate(title_headline=F("title"), content_headline=Value(""))
+
+        options = {
+            "config": self.search_config,
+            "start_sel": HEADLINE_START_SEL,
+            "stop_sel": HEADLINE_STOP_SEL,
+        }
+        return self.annotate(
+            title_headline=SearchHeadline(
+                "title", search_query, highlight_all=True, **options
+            ),
+            content_headline=SearchHeadline(
+                "content",
+                search_query,
+                max_words=35,
+                min_words=15,
+                max_fragments=2,
+                fragment_delimiter=" … ",
+                **options,
+            ),
+        )
+
+    def update_excerpt(self) -> int:
+        """excerpt 필드를 content 필드로부터 데이터베이스에서 일괄 갱신합니다."""
+
+        return self.update(
+            excerpt=get_excerpt_expression(F("content"), POST_EXCERPT_LENGTH)
+        )
+
+    @classmethod
+    def get_search_vector(cls, title, content) -> CombinedSearchVector:
+        """제목(A), 내용(B) 가중치의 검색 벡터 표현식 (필드명 혹은 Value 등의 표현식)"""
+
+        return SearchVector(title, weight="A", config=cls.search_config) + SearchVector(
+            content, weight="B", config=cls.search_config
+        )
+
+    def update_search_vector(self) -> int:
+        """search_vector 필드를 제목(A), 내용(B) 가중치로 갱신합니다."""
+
+        return self.update(search_vector=self.get_search_vector("title", "content"))
 
     def create(self, **kwargs):
         kwargs.setdefault("status", Post.Status.PUBLISHED)
         return super().create(**kwargs)
 
+    def bulk_create(self, objs, *args, **kwargs):
+        """save()/라이프사이클 훅이 호출되지 않으므로, slug/excerpt/search_vector 를 배치 단위로 채웁니다."""
+
+        objs = list(objs)
+        Post.assign_slugs(objs)
+        for post in objs:
+            # 요약/검색 벡터를 별도 UPDATE 없이, 같은 INSERT 문에서 계산합니다.
+            if not post.excerpt:
+                post.set_excerpt_expression()
+            post.set_search_vector_expression()
+
+        try:
+            return super().bulk_create(objs, *args, **kwargs)
+        finally:
+            for post in objs:
+                post.clear_expression_values()
+
 
 class Post(LifecycleModelMixin, models.Model):
     class Status(models.TextChoices):  # 문자열 선택지
@@ -73,6 +266,13 @@ class Post(LifecycleModelMixin, models.Model):
         default=Status.DRAFT,
     )
     content = models.TextField()
+    # 목록 페이지에서 큰 content 필드를 조회하지 않도록, 내용 앞부분을 미리 저장해둡니다.
+    excerpt = models.CharField(
+        max_length=POST_EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        help_text="content 필드로 부터 자동생성합니다.",
+    )
     tag_set = models.ManyToManyField(
         "Tag",
         blank=True,
@@ -82,6 +282,11 @@ class Post(LifecycleModelMixin, models.Model):
         through_fields=("post", "tag"),
     )
 
+    # 제목/내용 전문 검색을 위한 컬럼
+    # save()/bulk_create() 시에 함께 계산하며, update() 등으로 변경한 경우에는
+    # PostQuerySet.update_search_vector() 로 다시 계산해주세요.
+    search_vector = SearchVectorField(null=True, editable=False)
+
     objects = PostQuerySet.as_manager()
 
     created_at = models.DateTimeField(auto_now_add=True)  # 최초 생성시각을 자동 저장
@@ -89,28 +294,145 @@ class Post(LifecycleModelMixin, models.Model):
 
     def slugify(self, force=False):
         if force or not self.slug:
-            self.slug = slugify(self.title, allow_unicode=True)
-            self.slug = self.slug[:112]
-            # 제목으로 만든 slug 문자열 뒤에 uuid 를 붙여 slug 의 유일성을 확보
-            self.slug += "-" + uuid4().hex[:8]
+            slug_max_length = self._meta.get_field("slug").max_length
+            self.slug = make_post_slug(self.title, slug_max_length)
+
+    @classmethod
+    def assign_slugs(cls, post_list: Iterable["Post"], force: bool = False) -> None:
+        """slug가 없는 (force 시에는 모든) 포스팅의 slug를 한 번에 생성합니다.
+
+        배치 내 중복과 데이터베이스의 기존 slug를 시도마다 한 번의 (slug 인덱스) 쿼리로 확인하고,
+        충돌한 포스팅만 다시 생성합니다.
+        """
+
+        post_list = list(post_list)
+        pending_list = [post for post in post_list if force or not post.slug]
+        # slug를 직접 지정한 포스팅과도 겹치지 않아야 합니다.
+        fixed_slug_set = (
+            set() if force else {post.slug for post in post_list if post.slug}
+        )
+
+        for __ in range(POST_SLUG_MAX_TRIES):
+            if not pending_list:
+                return
+
+            for post in pending_list:
+                post.slugify(force=True)
+
+            used_slug_set = set(
+                cls.objects.filter(slug__in=[post.slug for post in pending_list])
+                .exclude(pk__in=[post.pk for post in pending_list if post.pk])
+                .values_list("slug", flat=True)
+            )
+            used_slug_set.update(fixed_slug_set)
+
+            collided_list = []
+            for post in pending_list:
+                if post.slug in used_slug_set:
+                    collided_list.append(post)
+                else:
+                    used_slug_set.add(post.slug)
+                    fixed_slug_set.add(post.slug)
+            pending_list = collided_list
+
+        if pending_list:
+            raise IntegrityError(
+                f"{len(pending_list)}개 포스팅의 유일한 slug 생성에 실패했습니다."
+            )
 
-    # def save(self, *args, **kwargs):
-    #     # save 시에 slug 필드를 자동으로 채워줌
-    #     self.slugify()
-    #     super().save(*args, **kwargs
+    def save(self, *args, **kwargs):
+        # save 시에 slug 필드를 자동으로 채워줌 (bulk_create 시에는 PostQuerySet.bulk_create 에서 채움)
+        is_slug_generated = not self.slug
+        self.slugify()
+
+        # 제목/내용만 지정해서 저장할 때에도, 요약/검색 벡터를 함께 저장합니다.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if "content" in update_fields:
+                update_fields.add("excerpt")
+            if {"title", "content"} & update_fields:
+                update_fields.add("search_vector")
+            kwargs["update_fields"] = update_fields
+
+        try:
+            if is_slug_generated:
+                self._save_with_slug_retry(*args, **kwargs)
+            else:
+                super().save(*args, **kwargs)
+        finally:
+            self.clear_expression_values()
+
+    def _save_with_slug_retry(self, *args, **kwargs):
+        # 저장 전에 slug 사용 여부를 조회하지 않고, 드물게 unique_slug 제약에 걸리면 slug를 다시 생성하여 저장합니다.
+        for tries in range(1, POST_SLUG_MAX_TRIES + 1):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError as e:
+                constraint_name = getattr(
+                    getattr(e.__cause__, "diag", None), "constraint_name", None
+                )
+                if constraint_name != "unique_slug" or tries == POST_SLUG_MAX_TRIES:
+                    raise
+                self.slugify(force=True)
+
+    def set_excerpt_expression(self) -> None:
+        """요약을 같은 INSERT/UPDATE 문에서 PostQuerySet.update_excerpt 와 같은 표현식으로 계산하도록 지정합니다."""
+
+        self.excerpt = get_excerpt_expression(Value(self.content), POST_EXCERPT_LENGTH)
+
+    def set_search_vector_expression(self) -> None:
+        """검색 벡터를 별도 UPDATE 없이 같은 INSERT/UPDATE 문에서 계산하도록, 표현식을 지정합니다."""
+
+        self.search_vector = PostQuerySet.get_search_vector(
+            Value(self.title), Value(self.content)
+        )
+
+    def clear_expression_values(self) -> None:
+        # 인스턴스에는 계산된 값 대신 표현식이 남아있으므로, 접근 시에 다시 조회하도록 합니다.
+        for field_name in ("excerpt", "search_vector"):
+            if hasattr(self.__dict__.get(field_name), "resolve_expression"):
+                delattr(self, field_name)
 
     @hook(BEFORE_UPDATE, when="content", has_changed=True)
     def on_changed_content(self):
-        print("content 필드 변경으로, updated_at 을 갱신합니다. ")
         self.updated_at = timezone.now()
 
+    @hook(BEFORE_CREATE)
+    @hook(BEFORE_UPDATE, when="content", has_changed=True)
+    def on_changed_excerpt_source(self):
+        # bulk_create 시에는 PostQuerySet.bulk_create 에서 채웁니다.
+        self.set_excerpt_expression()
+
     @hook(AFTER_UPDATE, when="status", was=Status.DRAFT, is_now=Status.PUBLISHED)
     def on_published(self):
         print("저자에게 이메일을 보냅니다.")
 
+    @hook(BEFORE_CREATE)
+    @hook(BEFORE_UPDATE, when_any=["title", "content"], has_changed=True)
+    def on_changed_search_fields(self):
+        # bulk_create 시에는 PostQuerySet.bulk_create 에서 채웁니다. bulk_update 시에는 직접 update_search_vector()를 호출해주세요.
+        self.set_search_vector_expression()
+
+    @property
+    def title_highlight(self) -> SafeString:
+        """PostQuerySet.with_headline 으로 조회했을 때, 검색어를 강조한 제목"""
+        return headline_to_html(getattr(self, "title_headline", self.title))
+
+    @property
+    def content_highlight(self) -> SafeString:
+        """PostQuerySet.with_headline 으로 조회했을 때, 검색어를 강조한 내용 일부"""
+        return headline_to_html(getattr(self, "content_headline", ""))
+
     class Meta:
         # unique=True 보다 강력한 Unique 제약사항 추가 방법
-        constraints = [UniqueConstraint("slug", name="unique_slug")]
+        # (표현식 인덱스가 아닌 UNIQUE 제약으로 생성하도록, fields 로 지정합니다.)
+        constraints = [UniqueConstraint(fields=["slug"], name="unique_slug")]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="blog_post_search_idx"),
+        ]
         verbose_name = "포스팅"
         verbose_name_plural = "포스팅 목록"
         permissions = [("view_premium_post", "프리미엄 블로그를 볼 수 있음")]
@@ -120,12 +442,6 @@ class Post(LifecycleModelMixin, models.Model):
         return f"{self.title} ({self.get_status_display()})"
 
 
-@receiver(pre_save, sender=Post)
-def pre_save_on_save(sender, instance: Post, **kwargs):
-    print("pre_save_on_save 호출")
-    instance.slugify()
-
-
 class Comment(TimestampedModel):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
@@ -1,3 +1,272 @@
-from django.test import TestCase
+from unittest import mock
+from uuid import UUID
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import POST_EXCERPT_LENGTH, Category, Post, PostTagRelation, Tag
+from core.testing import assert_view_max_queries
+
+
+class PostListQueryCountTest(TestCase):
+    """포스팅 목록의 쿼리 수가 포스팅/태그 수에 비례하지 않는지 (N+1 쿼리) 확인합니다."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # 마이그레이션에서 id=1 사용자/카테고리를 생성하므로, 겹치지 않는 id를 지정합니다.
+        author = get_user_model().objects.create(pk=1000, username="author")
+        category = Category.objects.create(pk=1000, name="장고")
+        tag_list = [Tag.objects.create(pk=1000 + i, name=f"태그{i}") for i in range(3)]
+
+        post_list = Post.objects.bulk_create(
+            [
+                Post(
+                    category=category,
+                    author=author,
+                    title=f"장고 포스팅 {i}",
+                    content=f"본문 {i}",
+                    status=Post.Status.PUBLISHED,
+                )
+                for i in range(25)
+            ]
+        )
+        PostTagRelation.objects.bulk_create(
+            [
+                PostTagRelation(post=post, tag=tag)
+                for index, post in enumerate(post_list)
+                for tag in tag_list[: index % 3 + 1]
+            ]
+        )
+
+    def test_post_list(self):
+        # 포스팅 페이지, 태그 prefetch, 예상 개수(EXPLAIN)
+        response = assert_view_max_queries(self.client, reverse("blog:post_list"), 3)
+        self.assertEqual(len(response.context["post_list"]), 20)
+
+        next_cursor = response.context["page_obj"].next_cursor
+        response = assert_view_max_queries(
+            self.client, reverse("blog:post_list") + f"?cursor={next_cursor}", 3
+        )
+        self.assertEqual(len(response.context["post_list"]), 5)
+
+    def test_post_list_search(self):
+        # 태그명이 일치하는 포스팅 id 목록을 먼저 조회하므로, 쿼리가 하나 더 실행됩니다.
+        response = assert_view_max_queries(
+            self.client, reverse("blog:post_list") + "?query=장고", 4
+        )
+        self.assertEqual(len(response.context["post_list"]), 20)
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create(pk=1000, username="author")
+        cls.category = Category.objects.create(pk=1000, name="장고")
+
+    def create_post(self, title: str, content: str = "") -> Post:
+        return Post.objects.create(
+            category=self.category, author=self.author, title=title, content=content
+        )
+
+    def test_save_computes_search_vector_in_same_query(self):
+        with CaptureQueriesContext(connection) as context:
+            post = self.create_post("장고 입문", "파이썬 웹 프레임워크")
+
+        post_write_sql_list = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(
+                ('UPDATE "blog_post"', 'INSERT INTO "blog_post"')
+            )
+        ]
+        self.assertEqual(len(post_write_sql_list), 1)
+        self.assertEqual(Post.objects.search("파이썬").get(), post)
+
+        post.title = "리액트 입문"
+        post.save(update_fields=["title"])
+        self.assertEqual(Post.objects.search("리액트").get(), post)
+        self.assertFalse(Post.objects.search("장고").exists())
+
+    def test_search_by_tag_name(self):
+        tagged_post = self.create_post("첫 포스팅")
+        matched_post = self.create_post("파이썬 포스팅")
+        tag = Tag.objects.create(pk=1000, name="Python")
+        PostTagRelation.objects.create(post=tagged_post, tag=tag)
+
+        # 태그명은 대소문자 구분없이 일치하고, 태그가 일치하면 검색 순위가 더 높습니다.
+        self.assertEqual(list(Post.objects.search("python")), [tagged_post])
+        self.assertEqual(list(Post.objects.search("파이썬")), [matched_post])
+
+        PostTagRelation.objects.create(post=matched_post, tag=tag)
+        Tag.objects.create(pk=1001, name="파이썬")
+        PostTagRelation.objects.create(post=tagged_post, tag_id=1001)
+        self.assertEqual(
+            list(Post.objects.search("파이썬")), [tagged_post, matched_post]
+        )
+
+        # 검색할 단어가 없는 검색어는 태그명으로만 찾습니다.
+        Tag.objects.create(pk=1002, name="++")
+        PostTagRelation.objects.create(post=matched_post, tag_id=1002)
+        self.assertEqual(list(Post.objects.search("++")), [matched_post])
+
+    def test_search_tag_with_many_posts(self):
+        tag = Tag.objects.create(pk=1000, name="Python")
+        matched_post = self.create_post("Python 입문")
+
+        def search(query):
+            with CaptureQueriesContext(connection) as context:
+                found_list = list(Post.objects.search(query))
+            return found_list, [q["sql"] for q in context.captured_queries]
+
+        __, sql_list = search("python")
+
+        post_list = Post.objects.bulk_create(
+            [
+                Post(category=self.category, author=self.author, title=f"포스팅 {i}")
+                for i in range(500)
+            ]
+        )
+        PostTagRelation.objects.bulk_create(
+            [PostTagRelation(post=post, tag=tag) for post in post_list]
+        )
+
+        found_list, many_sql_list = search("python")
+
+        # 태그 포스팅 id 목록을 쿼리에 나열하지 않으므로, 포스팅 수와 무관하게 같은 쿼리 1개로 조회합니다.
+        self.assertEqual(many_sql_list, sql_list)
+        self.assertEqual(len(sql_list), 1)
+        # 태그가 일치하는 포스팅이 먼저, 제목만 일치하는 포스팅이 마지막에 조회됩니다.
+        self.assertEqual(len(found_list), 501)
+        self.assertEqual(found_list[-1], matched_post)
+
+    def test_excerpt_is_same_for_save_bulk_create_and_update(self):
+        content = "  첫 줄\n\n둘째\t\t줄  " + "가" * 300
+        expected = ("첫 줄 둘째 줄 " + "가" * 300)[:POST_EXCERPT_LENGTH]
+
+        post = self.create_post("저장", content)
+        [bulk_post] = Post.objects.bulk_create(
+            [
+                Post(
+                    category=self.category,
+                    author=self.author,
+                    title="일괄 생성",
+                    content=content,
+                )
+            ]
+        )
+        self.assertEqual(post.excerpt, expected)
+        self.assertEqual(bulk_post.excerpt, expected)
+
+        Post.objects.update(excerpt="")
+        Post.objects.all().update_excerpt()
+        self.assertEqual(
+            set(Post.objects.values_list("excerpt", flat=True)), {expected}
+        )
+
+        post.content = "바뀐\n내용"
+        post.save(update_fields=["content"])
+        self.assertEqual(post.excerpt, "바뀐 내용")
+
+
+class PostSlugTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create(pk=1000, username="author")
+        cls.category = Category.objects.create(pk=1000, name="장고")
+
+    def create_post(self, title: str) -> Post:
+        return Post.objects.create(
+            category=self.category, author=self.author, title=title, content=""
+        )
+
+    def test_create_without_slug_lookup(self):
+        with CaptureQueriesContext(connection) as context:
+            post = self.create_post("장고 입문")
+
+        self.assertRegex(post.slug, r"^장고-입문-[0-9a-f]{8}$")
+        self.assertFalse(
+            [
+                query["sql"]
+                for query in context.captured_queries
+                if query["sql"].startswith("SELECT")
+            ]
+        )
+
+    def test_regenerate_slug_on_collision(self):
+        uuid1 = UUID("aaaaaaaa" + "0" * 24)
+        uuid2 = UUID("bbbbbbbb" + "0" * 24)
+        with mock.patch("blog.models.uuid4", side_effect=[uuid1, uuid1, uuid2]):
+            post1 = self.create_post("장고")
+            post2 = self.create_post("장고")
+
+        self.assertEqual(post1.slug, "장고-aaaaaaaa")
+        self.assertEqual(post2.slug, "장고-bbbbbbbb")
+        self.assertEqual(Post.objects.get(pk=post2.pk).slug, post2.slug)
+
+    def test_bulk_create_regenerates_only_collided_slugs(self):
+        uuid1 = UUID("aaaaaaaa" + "0" * 24)
+        uuid2 = UUID("bbbbbbbb" + "0" * 24)
+        uuid3 = UUID("cccccccc" + "0" * 24)
+        with mock.patch("blog.models.uuid4", side_effect=[uuid1]):
+            self.create_post("장고")
+
+        post_list = [
+            Post(category=self.category, author=self.author, title="장고", content="")
+            for __ in range(2)
+        ]
+        # 첫 번째 포스팅은 기존 slug와, 두 번째 포스팅은 없는 slug로 생성된 뒤
+        # 첫 번째 포스팅만 다시 생성합니다.
+        with mock.patch(
+            "blog.models.uuid4", side_effect=[uuid1, uuid2, uuid3]
+        ), CaptureQueriesContext(connection) as context:
+            Post.objects.bulk_create(post_list)
+
+        self.assertEqual(
+            [post.slug for post in post_list], ["장고-cccccccc", "장고-bbbbbbbb"]
+        )
+        # 시도마다 한 번의 slug 조회 쿼리
+        slug_query_list = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(len(slug_query_list), 2)
+
+    def test_bulk_create_raises_after_max_tries(self):
+        uuid1 = UUID("aaaaaaaa" + "0" * 24)
+        with mock.patch("blog.models.uuid4", return_value=uuid1):
+            self.create_post("장고")
+            with self.assertRaises(IntegrityError):
+                Post.objects.bulk_create(
+                    [
+                        Post(
+                            category=self.category,
+                            author=self.author,
+                            title="장고",
+                            content="",
+                        )
+                    ]
+                )
+
+    def test_given_slug_collision_raises(self):
+        post = self.create_post("장고")
+        with self.assertRaises(IntegrityError):
+            Post.objects.create(
+                category=self.category,
+                author=self.author,
+                title="다른 제목",
+                content="",
+                slug=post.slug,
+            )
+
+
+class LoadBlogPostsCommandTest(SimpleTestCase):
+    def test_reject_invalid_comments_multiplier(self):
+        for multiplier in ("0", "-1"):
+            with self.subTest(multiplier=multiplier):
+                with self.assertRaisesMessage(CommandError, "--comments-multiplier"):
+                    call_command("load_blog_posts", "--comments-multiplier", multiplier)
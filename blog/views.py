@@ -2,9 +2,8 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.files import File
-from django.db.models import Q
 from django.forms import formset_factory, modelformset_factory, inlineformset_factory
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
 from django.views.decorators.http import require_http_methods
@@ -13,11 +12,27 @@ from vanilla import CreateView, ListView, DetailView, UpdateView, FormView
 
 from blog.forms import ReviewForm, DemoForm, MemoForm, TagForm
 from blog.models import Post, Review, Memo, MemoGroup, Tag
+from core.paginator import CursorPaginator, InvalidCursor
 from core.decorators import login_required_hx
 
 
 # Create your views here.
 
+# 검색 페이지에서 보여줄 최대 포스팅 수
+SEARCH_RESULT_LIMIT = 50
+
+POST_LIST_PAGE_SIZE = 20
+
+# post_list.html 템플릿에서 사용하는 필드
+POST_LIST_ONLY_FIELDS = (
+    "id",
+    "title",
+    "slug",
+    "status",
+    "excerpt",
+    "author__username",
+)
+
 
 @login_required
 @permission_required("blog.view_post", raise_exception=False)
@@ -43,24 +58,56 @@ def post_list(request):
     post_qs = Post.objects.all()
 
     if query:
-        post_qs = post_qs.filter(
-            Q(tag_set__name__in=[query]) | Q(title__icontains=query)
-        )
+        # 제목/내용 전문 검색과 태그명 일치 검색 (PostQuerySet.search)
+        post_qs = post_qs.search(query).with_headline(query)
+        ordering = ("-search_rank", "-id")
+    else:
+        ordering = ("-id",)
 
-    post_qs = post_qs.select_related("author")
+    # 목록에서 쓰는 필드만 조회합니다. (content 대신 미리 저장해둔 excerpt 사용)
+    post_qs = post_qs.select_related("author").only(*POST_LIST_ONLY_FIELDS)
     post_qs = post_qs.prefetch_related("tag_set")
+
+    # OFFSET/COUNT 없이 커서로 페이지를 조회하고, 전체 개수는 실행 계획의 예상치를 사용합니다.
+    paginator = CursorPaginator(
+        post_qs, POST_LIST_PAGE_SIZE, ordering=ordering, count_mode="estimated"
+    )
+    try:
+        page_obj = paginator.page(request.GET.get("cursor"))
+    except InvalidCursor as e:
+        raise Http404(str(e))
+
+    query_dict = request.GET.copy()
+    query_dict.pop("cursor", None)
+
     return render(
-        request, "blog/post_list.html", {"query": query, "post_list": post_qs}
+        request,
+        "blog/post_list.html",
+        {
+            "query": query,
+            "post_list": page_obj.object_list,
+            "page_obj": page_obj,
+            "pagination_querystring": query_dict.urlencode(),
+        },
     )
 
 
 def search(request):
     query = request.GET.get("query", "").strip()
+
+    post_list = []
+    if query:
+        post_qs = Post.objects.search(query)
+        post_qs = post_qs.select_related("author").only(*POST_LIST_ONLY_FIELDS)
+        post_qs = post_qs.prefetch_related("tag_set")
+        post_list = post_qs.with_headline(query)[:SEARCH_RESULT_LIMIT]
+
     return render(
         request,
         "blog/search.html",
         {
             "query": query,
+            "post_list": post_list,
         },
     )
 
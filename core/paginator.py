@@ -0,0 +1,255 @@
+# core/paginator.py
+
+import base64
+import datetime
+import json
+from typing import Any, List, Literal, Optional, Sequence, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, FieldError, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Field, Q, QuerySet
+
+CountMode = Literal["exact", "estimated", None]
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder는 시각을 밀리초 단위로 자르므로, 키셋 비교가 어긋나지 않도록 마이크로초까지 유지합니다."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """COUNT(*) 없이, PostgreSQL 실행 계획의 예상 행 수로 레코드 수를 추정합니다.
+
+    PostgreSQL이 아닌 데이터베이스에서는 정확한 개수를 반환합니다.
+    """
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CursorPage(Sequence):
+    def __init__(
+        self,
+        object_list: List,
+        paginator: "CursorPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage: {len(self)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], is_previous=False)
+
+    @property
+    def previous_cursor(self) -> Optional[str]:
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], is_previous=True)
+
+    @property
+    def last_cursor(self) -> str:
+        """마지막 페이지를 가리키는 커서 (CursorPaginator.last_cursor 참고)"""
+        return self.paginator.last_cursor
+
+
+class CursorPaginator:
+    """OFFSET/COUNT 없이, 정렬 필드 값을 기준으로 다음/이전 페이지를 조회하는 페이지네이터 (키셋 페이지네이션)
+
+    ordering은 레코드를 유일하게 정렬해야 하므로, 마지막 필드는 기본키와 같은 유일 필드여야 합니다.
+    커서는 페이지 경계 레코드의 정렬 필드 값을 담은 문자열이며, 페이지 깊이와 무관하게 인덱스로 조회합니다.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        ordering: Sequence[str],
+        count_mode: CountMode = None,
+    ):
+        if not ordering:
+            raise ValueError("ordering을 지정해주세요.")
+
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.count_mode = count_mode
+
+    @property
+    def count(self) -> Optional[int]:
+        """count_mode에 따라 전체 레코드 수(exact), 추정치(estimated), 혹은 None을 반환합니다."""
+
+        if not hasattr(self, "_count"):
+            if self.count_mode == "exact":
+                self._count = self.queryset.count()
+            elif self.count_mode == "estimated":
+                self._count = estimate_count(self.queryset)
+            else:
+                self._count = None
+        return self._count
+
+    @property
+    def last_cursor(self) -> str:
+        """마지막 페이지를 가리키는 커서
+
+        전체 개수 없이 끝에서부터 per_page 개를 조회하므로, 마지막 페이지는 항상 꽉 찬 페이지입니다.
+        처음부터 다음 페이지로 이동하여 도달한 마지막 페이지(나머지 개수)와는 경계가 다를 수 있으며,
+        이후 이전/다음 페이지 이동은 이 경계를 기준으로 합니다.
+        """
+        return self._dump_cursor(None, is_previous=True)
+
+    def page(self, cursor: Optional[str] = None) -> CursorPage:
+        position, is_previous = self.decode_cursor(cursor)
+
+        ordering = self.ordering
+        if is_previous:
+            # 이전 페이지는 역순으로 조회한 뒤, 다시 뒤집습니다.
+            ordering = tuple(self._reverse(field) for field in ordering)
+
+        qs = self.queryset.order_by(*ordering)
+        if position is not None:
+            qs = qs.filter(self._get_keyset_q(ordering, position))
+
+        # 다음 페이지가 있는지 확인하기 위해 1개를 더 조회합니다.
+        object_list = list(qs[: self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+
+        if is_previous:
+            object_list.reverse()
+            return CursorPage(
+                object_list, self, has_next=position is not None, has_previous=has_more
+            )
+
+        return CursorPage(
+            object_list, self, has_next=has_more, has_previous=position is not None
+        )
+
+    def encode_cursor(self, obj, is_previous: bool) -> str:
+        position = [self._get_value(obj, field) for field in self.ordering]
+        return self._dump_cursor(position, is_previous)
+
+    def decode_cursor(self, cursor: Optional[str]) -> Tuple[Optional[List], bool]:
+        if not cursor:
+            return None, False
+
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            position = data["p"]
+            is_previous = bool(data.get("r", False))
+        except (ValueError, TypeError, KeyError) as e:
+            raise InvalidCursor(f"Invalid cursor : {cursor}") from e
+
+        if position is not None:
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise InvalidCursor(f"Invalid cursor : {cursor}")
+            position = self._clean_position(position, cursor)
+
+        return position, is_previous
+
+    def _clean_position(self, position: List, cursor: str) -> List:
+        """커서의 각 값을 정렬 필드 타입으로 변환합니다. 변조된 커서는 InvalidCursor 예외를 발생시킵니다."""
+
+        cleaned_position = []
+        for field, value in zip(self.ordering, position):
+            if value is None:
+                raise InvalidCursor(f"Invalid cursor : {cursor}")
+
+            model_field = self._get_model_field(field.lstrip("-"))
+            if model_field is not None:
+                try:
+                    value = model_field.to_python(value)
+                except (ValidationError, TypeError, ValueError) as e:
+                    raise InvalidCursor(f"Invalid cursor : {cursor}") from e
+            cleaned_position.append(value)
+        return cleaned_position
+
+    def _get_model_field(self, name: str) -> Optional[Field]:
+        """정렬 필드명에 해당하는 모델 필드, 혹은 annotate 한 표현식의 출력 필드"""
+
+        try:
+            return self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            pass
+
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is None:
+            return None
+        try:
+            return annotation.output_field
+        except FieldError:
+            return None
+
+    @staticmethod
+    def _dump_cursor(position: Optional[List], is_previous: bool) -> str:
+        data = {"p": position}
+        if is_previous:
+            data["r"] = 1
+        dumped = json.dumps(data, cls=CursorJSONEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(dumped.encode("utf-8")).decode().rstrip("=")
+
+    @staticmethod
+    def _reverse(field: str) -> str:
+        return field[1:] if field.startswith("-") else "-" + field
+
+    @staticmethod
+    def _get_value(obj, field: str) -> Any:
+        name = field.lstrip("-")
+        if isinstance(obj, dict):
+            return obj[name]
+        return getattr(obj, name)
+
+    @staticmethod
+    def _get_keyset_q(ordering: Sequence[str], position: List) -> Q:
+        """(a, b, c) > (x, y, z) 비교를 a > x OR (a = x AND b > y) OR ... 조건으로 만듭니다."""
+
+        keyset_q = Q()
+        equal_kwargs = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset_q |= Q(**equal_kwargs, **{f"{name}__{lookup}": value})
+            equal_kwargs[name] = value
+        return keyset_q
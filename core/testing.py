@@ -0,0 +1,52 @@
+# core/testing.py
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def assert_max_queries(
+    max_count: int, using: str = DEFAULT_DB_ALIAS
+) -> Iterator[CaptureQueriesContext]:
+    """블록 안에서 실행된 쿼리가 max_count 개를 넘으면 AssertionError를 발생시킵니다.
+
+    N+1 쿼리를 잡아내기 위해, 실패 시에는 실행된 쿼리 목록을 함께 출력합니다.
+
+        with assert_max_queries(5):
+            client.get("/hottrack/")
+    """
+
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    executed_count = len(context.captured_queries)
+    if executed_count > max_count:
+        sql_list = "\n".join(
+            f"{index}. {query['sql']}"
+            for index, query in enumerate(context.captured_queries, start=1)
+        )
+        raise AssertionError(
+            f"{executed_count} queries executed, {max_count} expected at most\n"
+            f"Captured queries were:\n{sql_list}"
+        )
+
+
+def assert_view_max_queries(
+    client: Client, path: str, max_count: int, status_code: int = 200, **extra
+):
+    """지정 주소를 GET 요청하여, 응답 상태 코드와 최대 쿼리 수를 확인하고 응답을 반환합니다.
+
+    템플릿 렌더링 중에 발생하는 지연 쿼리도 포함됩니다.
+    """
+
+    with assert_max_queries(max_count):
+        response = client.get(path, **extra)
+
+    assert (
+        response.status_code == status_code
+    ), f"{path} responded {response.status_code}, {status_code} expected"
+    return response
@@ -1,3 +1,79 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from core.paginator import CursorPaginator, InvalidCursor
+
+
+def make_cursor(position, is_previous=False) -> str:
+    data = {"p": position}
+    if is_previous:
+        data["r"] = 1
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+class CursorPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        User.objects.bulk_create(
+            [
+                # 마이그레이션에서 id=1 사용자를 생성하므로, 겹치지 않는 id를 지정합니다.
+                User(pk=1000 + i, username=f"user{i:02d}", email=f"user{i}@localhost")
+                for i in range(7)
+            ]
+        )
+        cls.user_qs = User.objects.filter(pk__gte=1000)
+
+    def get_paginator(self, ordering=("-date_joined", "-id")) -> CursorPaginator:
+        return CursorPaginator(self.user_qs, 3, ordering=ordering)
+
+    def test_next_and_previous_pages(self):
+        paginator = self.get_paginator(ordering=("username", "id"))
+
+        page1 = paginator.page()
+        page2 = paginator.page(page1.next_cursor)
+        page3 = paginator.page(page2.next_cursor)
+
+        self.assertEqual(
+            [user.username for user in page2], ["user03", "user04", "user05"]
+        )
+        self.assertEqual([user.username for user in page3], ["user06"])
+        self.assertFalse(page3.has_next())
+        self.assertEqual(list(paginator.page(page2.previous_cursor)), list(page1))
+
+    def test_last_cursor_returns_full_page_from_the_end(self):
+        paginator = self.get_paginator(ordering=("username", "id"))
+
+        last_page = paginator.page(paginator.last_cursor)
+
+        self.assertEqual(
+            [user.username for user in last_page], ["user04", "user05", "user06"]
+        )
+        self.assertFalse(last_page.has_next())
+        self.assertTrue(last_page.has_previous())
+
+    def test_tampered_cursor_value_types(self):
+        paginator = self.get_paginator()
+        cursor_list = [
+            make_cursor(["2024-01-01T00:00:00", "abc"]),
+            make_cursor(["not a datetime", 1]),
+            make_cursor([["2024-01-01"], 1]),
+            make_cursor([None, 1]),
+            make_cursor(["2024-01-01T00:00:00"]),
+            "not base64 !!",
+        ]
+        for cursor in cursor_list:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    paginator.page(cursor)
+
+    def test_cursor_values_are_converted_to_field_types(self):
+        paginator = self.get_paginator()
+        page1 = paginator.page()
+
+        position, __ = paginator.decode_cursor(page1.next_cursor)
+
+        self.assertEqual(position, [page1[-1].date_joined, page1[-1].id])
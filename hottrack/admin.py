@@ -2,12 +2,12 @@ from django.contrib import admin
 from django.utils.html import format_html
 
 from .filters import ReleaseDateFilter
+from .mixins import QueryPlanMixin
 from .models import Song
-from .utils.melon import get_likes_dict
 
 
 @admin.register(Song)
-class SongAdmin(admin.ModelAdmin):
+class SongAdmin(QueryPlanMixin, admin.ModelAdmin):
     search_fields = ["name", "artist__name", "album__name"]  # where
     list_display = [
         "cover_image_tag",
@@ -19,6 +19,9 @@ class SongAdmin(admin.ModelAdmin):
         "release_date",
     ]
     list_filter = ["genre_set", ReleaseDateFilter]
+    # list_display 의 artist/album 은 JOIN 으로, genre_html 의 genre_set 은 prefetch 로 조회합니다.
+    list_select_related = ["artist", "album"]
+    query_prefetch_related = ["genre_set"]
     actions = ["update_like_count"]
 
     def has_add_permission(self, request):
@@ -33,33 +36,14 @@ class SongAdmin(admin.ModelAdmin):
     # def has_view_permission(self, request, obj=None):
     #     return super().has_view_permission(request, obj)
 
-    # genre_html 메서드의 genre_set M2M 메서드 쿼리셋을 위해
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        qs = qs.prefetch_related("genre_set")
-        return qs
-
     @admin.display(description="장르")
     def genre_html(self, song):
         genre_qs = song.genre_set.all()
         return ", ".join(genre.name for genre in genre_qs)
 
     def update_like_count(self, request, queryset):
-        melon_uid_list = queryset.values_list("id", flat=True)
-        likes_dict = get_likes_dict(melon_uid_list)
-
-        changed_count = 0
-        for song in queryset:
-            if song.like_count != likes_dict.get(song.id):
-                song.like_count = likes_dict.get(song.id)
-                # song.save()  # 모델의 모든 필드에 대해서 업데이트를 수행
-                # song.save(update_fields=["like_count"])
-                changed_count += 1
-
-        Song.objects.bulk_update(
-            queryset,
-            fields=["like_count"],
-        )
+        # URL 길이 제한에 맞춰 나눈 요청들을 동시에 보내고, 변경된 곡만 갱신합니다.
+        changed_count = queryset.update_like_count()
 
         self.message_user(request, f"{changed_count} 곡의 좋아요 갱신 완료")
 
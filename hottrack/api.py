@@ -0,0 +1,207 @@
+# hottrack/api.py
+
+import datetime
+from typing import Dict, List, Optional, Sequence
+
+from django.core.exceptions import BadRequest
+from django.db.models import F, QuerySet
+from django.http import Http404, JsonResponse
+from django.views import View
+from django.views.decorators.gzip import gzip_page
+
+from core.paginator import CursorPaginator, InvalidCursor
+from hottrack.mixins import SongConditionalGetMixin
+from hottrack.models import Song
+
+
+# API 필드명 : 조회할 모델 필드 (관계 필드는 JOIN 으로 함께 조회)
+SONG_API_FIELDS: Dict[str, str] = {
+    "id": "id",
+    "name": "name",
+    "slug": "slug",
+    "rank": "rank",
+    "like_count": "like_count",
+    "release_date": "release_date",
+    "cover_url": "cover_url",
+    "lyrics": "lyrics",
+    "artist_id": "artist_id",
+    "artist_name": "artist__name",
+    "album_id": "album_id",
+    "album_name": "album__name",
+}
+
+# ?fields 인자가 없을 때 목록에서 응답할 필드 (가사처럼 큰 필드는 제외)
+DEFAULT_SONG_LIST_API_FIELDS = (
+    "id",
+    "name",
+    "artist_name",
+    "rank",
+    "like_count",
+    "release_date",
+    "cover_url",
+)
+
+SONG_API_PAGE_SIZE = 20
+SONG_API_MAX_PAGE_SIZE = 100
+
+
+def get_api_field_list(request, default_fields: Sequence[str]) -> List[str]:
+    """?fields=id,name 형식의 인자로 응답할 필드 목록을 반환합니다."""
+
+    value = request.GET.get("fields", "").strip()
+    if not value:
+        return list(default_fields)
+
+    field_list = [name.strip() for name in value.split(",") if name.strip()]
+    invalid_field_list = [name for name in field_list if name not in SONG_API_FIELDS]
+    if invalid_field_list:
+        raise BadRequest(f"Invalid fields : {', '.join(invalid_field_list)}")
+
+    # 순서를 유지하며 중복을 제거합니다.
+    return list(dict.fromkeys(field_list))
+
+
+def get_api_page_size(request) -> int:
+    try:
+        page_size = int(request.GET.get("page_size", SONG_API_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest("page_size 인자는 정수여야 합니다.")
+    return max(1, min(page_size, SONG_API_MAX_PAGE_SIZE))
+
+
+def values_songs(song_qs: QuerySet[Song], field_list: Sequence[str]) -> QuerySet:
+    """모델 인스턴스를 만들지 않고, 지정 필드만 사전으로 조회하는 쿼리셋을 반환합니다."""
+
+    field_name_list = []
+    expression_dict = {}
+    for name in field_list:
+        lookup = SONG_API_FIELDS.get(name, name)
+        if lookup == name:
+            field_name_list.append(name)
+        else:
+            expression_dict[name] = F(lookup)
+    return song_qs.values(*field_name_list, **expression_dict)
+
+
+def api_response(data: Dict) -> JsonResponse:
+    # 한글을 \uXXXX 로 이스케이프하지 않고, 구분자 공백을 없애서 응답 크기를 줄입니다.
+    return JsonResponse(
+        data, json_dumps_params={"ensure_ascii": False, "separators": (",", ":")}
+    )
+
+
+class SongListApiView(SongConditionalGetMixin, View):
+    """차트 순위 순의 곡 목록 (커서 페이지네이션)
+
+    응답 : {"results": [...], "next": 다음 페이지 주소, "previous": 이전 페이지 주소}
+    """
+
+    ordering = ("rank", "id")
+    # 응답이 로그인 사용자와 무관하므로, 로그인 사용자에게도 조건부 응답합니다.
+    conditional_for_authenticated = True
+
+    def get_queryset(self) -> QuerySet[Song]:
+        return Song.objects.all()
+
+    def get_ordering(self) -> Sequence[str]:
+        return self.ordering
+
+    def get(self, request, *args, **kwargs):
+        field_list = get_api_field_list(request, DEFAULT_SONG_LIST_API_FIELDS)
+        ordering = self.get_ordering()
+
+        # 커서를 만들려면 정렬 필드 값이 필요하므로, 요청하지 않은 정렬 필드도 함께 조회합니다.
+        extra_field_list = [
+            field.lstrip("-")
+            for field in ordering
+            if field.lstrip("-") not in field_list
+        ]
+        song_qs = values_songs(self.get_queryset(), field_list + extra_field_list)
+
+        paginator = CursorPaginator(song_qs, get_api_page_size(request), ordering)
+        try:
+            page = paginator.page(request.GET.get("cursor"))
+        except InvalidCursor as e:
+            raise BadRequest(str(e))
+
+        result_list = page.object_list
+        if extra_field_list:
+            result_list = [
+                {name: row[name] for name in field_list} for row in result_list
+            ]
+
+        return api_response(
+            {
+                "results": result_list,
+                "next": self.get_page_url(page.next_cursor),
+                "previous": self.get_page_url(page.previous_cursor),
+            }
+        )
+
+    def get_page_url(self, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        query_dict = self.request.GET.copy()
+        query_dict["cursor"] = cursor
+        return f"{self.request.path}?{query_dict.urlencode()}"
+
+
+class SongSearchApiView(SongListApiView):
+    """곡명/가수명/앨범명 검색 결과 (검색 순위 순)"""
+
+    ordering = ("-search_rank", "rank", "id")
+
+    def get_queryset(self) -> QuerySet[Song]:
+        query = self.request.GET.get("query", "").strip()
+        if not query:
+            raise BadRequest("query 인자를 지정해주세요.")
+        return super().get_queryset().search(query)
+
+
+class SongArchiveApiView(SongListApiView):
+    """발매 연도/월/일 별 곡 목록 (최근 발매일 순)"""
+
+    ordering = ("-release_date", "-id")
+
+    def get_queryset(self) -> QuerySet[Song]:
+        year = self.kwargs["year"]
+        month = self.kwargs.get("month")
+        day = self.kwargs.get("day")
+
+        try:
+            if day is not None:
+                since = datetime.date(year, month, day)
+                until = since + datetime.timedelta(days=1)
+            elif month is not None:
+                since = datetime.date(year, month, 1)
+                until = (since + datetime.timedelta(days=31)).replace(day=1)
+            else:
+                since = datetime.date(year, 1, 1)
+                until = datetime.date(year + 1, 1, 1)
+        except ValueError:
+            raise Http404("Invalid date")
+
+        # release_date 인덱스를 활용할 수 있도록, 날짜 함수 대신 범위로 조회합니다.
+        return (
+            super()
+            .get_queryset()
+            .filter(release_date__gte=since, release_date__lt=until)
+        )
+
+
+class SongDetailApiView(SongConditionalGetMixin, View):
+    conditional_for_authenticated = True
+
+    def get(self, request, pk):
+        field_list = get_api_field_list(request, SONG_API_FIELDS.keys())
+        song_dict = values_songs(Song.objects.filter(pk=pk), field_list).first()
+        if song_dict is None:
+            raise Http404("No song found")
+        return api_response(song_dict)
+
+
+# 응답 압축 (Accept-Encoding 에 gzip 이 있을 때)
+song_list_api = gzip_page(SongListApiView.as_view())
+song_search_api = gzip_page(SongSearchApiView.as_view())
+song_archive_api = gzip_page(SongArchiveApiView.as_view())
+song_detail_api = gzip_page(SongDetailApiView.as_view())
@@ -0,0 +1,8 @@
+"""hottrack 성능 측정 도구
+
+- generator : 측정용 가상 곡 데이터 생성/삭제
+- image_server : 커버 이미지 다운로드를 흉내내는 로컬 이미지 서버
+- runner : 뷰 별 응답 시간 백분위수, 쿼리 수, 최대 메모리 측정
+
+manage.py bench_hottrack --settings=mysite.settings_bench 명령으로 실행합니다.
+"""
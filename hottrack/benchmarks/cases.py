@@ -0,0 +1,55 @@
+# hottrack/benchmarks/cases.py
+
+from typing import List
+
+from django.urls import reverse
+
+from hottrack.models import Song
+from hottrack.utils.cover import evict_cached_covers
+from hottrack.utils.http import fetched_bytes_cache
+
+from .runner import BenchmarkCase
+
+
+def get_default_cases(song: Song, query: str = "love") -> List[BenchmarkCase]:
+    """hottrack 주요 뷰의 측정 항목 목록. 날짜/상세/커버 항목은 지정 곡을 기준으로 요청합니다."""
+
+    release_date = song.release_date
+
+    def clear_cover_cache():
+        # 렌더링된 커버와 원본 응답 캐시를 모두 비워서, 다운로드부터 다시 하도록 합니다.
+        evict_cached_covers(song.pk)
+        fetched_bytes_cache.clear()
+
+    cover_url = reverse("hottrack:cover_png", args=[song.pk]) + "?size=256"
+
+    return [
+        BenchmarkCase("index", reverse("hottrack:index")),
+        BenchmarkCase("index (query)", reverse("hottrack:index") + f"?query={query}"),
+        BenchmarkCase("archive index", reverse("hottrack:song_archive_index")),
+        BenchmarkCase(
+            "archive year",
+            reverse("hottrack:song_archive_year", args=[release_date.year]),
+        ),
+        BenchmarkCase(
+            "archive month",
+            reverse(
+                "hottrack:song_archive_month",
+                args=[release_date.year, release_date.month],
+            ),
+        ),
+        BenchmarkCase(
+            "archive day",
+            reverse(
+                "hottrack:song_archive_day",
+                args=[release_date.year, release_date.month, release_date.day],
+            ),
+        ),
+        BenchmarkCase("song_detail", reverse("hottrack:song_detail", args=[song.pk])),
+        BenchmarkCase("song_detail (date/slug)", song.get_absolute_url()),
+        BenchmarkCase("export (csv)", reverse("hottrack:export", args=["csv"])),
+        BenchmarkCase("export (xlsx)", reverse("hottrack:export", args=["xlsx"])),
+        BenchmarkCase("cover_png (cached)", cover_url),
+        BenchmarkCase("cover_png (miss)", cover_url, setup=clear_cover_cache),
+        BenchmarkCase("api songs", reverse("hottrack:api_song_list")),
+    ]
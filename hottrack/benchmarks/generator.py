@@ -0,0 +1,152 @@
+# hottrack/benchmarks/generator.py
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterator, List
+
+from django.core.files.storage import default_storage
+
+from hottrack.cache import (
+    invalidate_release_year_list,
+    invalidate_song_cards,
+    touch_song_data_updated_at,
+)
+from hottrack.models import Album, Artist, Genre, ReleaseDateCount, Song
+from hottrack.utils.cover import COVER_CACHE_DIR, evict_cached_covers
+from hottrack.utils.jsonstream import iter_batches
+
+
+# 실제 멜론 id와 겹치지 않도록, 측정용 레코드는 이 값부터 id를 할당합니다.
+BENCH_ID_OFFSET = 2_000_000_000
+
+BENCH_GENRE_PREFIX = "bench-genre-"
+
+# 검색 성능 측정에 사용할 수 있도록, 곡명/가수명/앨범명에 섞어 넣는 단어들
+WORD_LIST = "love night summer blue dream star rain heart 사랑 이별 여름 밤 바다 노래 우리 봄".split()
+
+
+@dataclass
+class CatalogueSize:
+    artists: int = 200
+    albums: int = 1000
+    genres: int = 20
+    songs: int = 10000
+    # 곡 당 장르 수
+    genres_per_song: int = 2
+
+
+def generate_catalogue(
+    size: CatalogueSize,
+    cover_url_base: str,
+    seed: int = 0,
+    since: date = date(2000, 1, 1),
+    days: int = 365 * 25,
+    batch_size: int = 1000,
+) -> None:
+    """측정용 가수/앨범/장르/곡/곡-장르 레코드를 생성합니다.
+
+    같은 seed로 생성하면 같은 데이터가 만들어지므로, 측정 결과를 서로 비교할 수 있습니다.
+    곡 커버 주소는 cover_url_base 아래의 주소로 지정합니다. (image_server 참고)
+    """
+
+    rnd = random.Random(seed)
+
+    def make_name(prefix: str, index: int) -> str:
+        return f"{rnd.choice(WORD_LIST)} {rnd.choice(WORD_LIST)} {prefix} {index}"
+
+    Artist.objects.bulk_create(
+        (
+            Artist(id=BENCH_ID_OFFSET + i, name=make_name("artist", i))
+            for i in range(size.artists)
+        ),
+        batch_size=batch_size,
+    )
+    Album.objects.bulk_create(
+        (
+            Album(id=BENCH_ID_OFFSET + i, name=make_name("album", i))
+            for i in range(size.albums)
+        ),
+        batch_size=batch_size,
+    )
+    genre_list = Genre.objects.bulk_create(
+        [Genre(name=f"{BENCH_GENRE_PREFIX}{i}") for i in range(size.genres)]
+    )
+    genre_pk_list = [genre.pk for genre in genre_list]
+
+    def iter_songs() -> Iterator[Song]:
+        for i in range(size.songs):
+            song = Song(
+                id=BENCH_ID_OFFSET + i,
+                rank=i % 100 + 1,
+                name=make_name("song", i),
+                artist_id=BENCH_ID_OFFSET + rnd.randrange(size.artists),
+                album_id=BENCH_ID_OFFSET + rnd.randrange(size.albums),
+                cover_url=f"{cover_url_base}/{i}.png",
+                lyrics="\n".join(make_name("line", n) for n in range(20)),
+                release_date=since + timedelta(days=rnd.randrange(days)),
+                like_count=rnd.randrange(100_000),
+            )
+            # 곡명에 번호가 들어가므로, 같은 발매일에 slug가 겹치지 않습니다.
+            song.slugify()
+            yield song
+
+    SongGenre = Song.genre_set.through
+    release_date_set = set()
+    for song_list in iter_batches(iter_songs(), batch_size):
+        Song.objects.bulk_create(song_list)
+        release_date_set.update(song.release_date for song in song_list)
+
+        genres_per_song = min(size.genres_per_song, len(genre_pk_list))
+        SongGenre.objects.bulk_create(
+            [
+                SongGenre(song_id=song.id, genre_id=genre_pk)
+                for song in song_list
+                for genre_pk in rnd.sample(genre_pk_list, genres_per_song)
+            ]
+        )
+
+    Song.objects.filter(pk__gte=BENCH_ID_OFFSET).update_search_vector()
+    ReleaseDateCount.refresh(release_date_set)
+    invalidate_caches()
+
+
+def clear_catalogue() -> int:
+    """generate_catalogue로 생성한 레코드와 렌더링된 커버 이미지를 삭제하고, 삭제한 곡 수를 반환합니다."""
+
+    song_qs = Song.objects.filter(pk__gte=BENCH_ID_OFFSET)
+    release_date_list: List[date] = list(
+        song_qs.values_list("release_date", flat=True).distinct()
+    )
+
+    # 곡-장르 관계, 차트 기록은 CASCADE로 함께 삭제됩니다.
+    __, deleted_dict = song_qs.delete()
+    Album.objects.filter(pk__gte=BENCH_ID_OFFSET).delete()
+    Artist.objects.filter(pk__gte=BENCH_ID_OFFSET).delete()
+    Genre.objects.filter(name__startswith=BENCH_GENRE_PREFIX).delete()
+
+    ReleaseDateCount.refresh(release_date_list)
+    invalidate_caches()
+    evict_catalogue_covers()
+    return deleted_dict.get(Song._meta.label, 0)
+
+
+def evict_catalogue_covers() -> int:
+    """측정 중에 렌더링된 측정용 곡의 커버 이미지를 삭제하고, 삭제한 파일 수를 반환합니다."""
+
+    try:
+        dir_names, __ = default_storage.listdir(COVER_CACHE_DIR)
+    except FileNotFoundError:
+        return 0
+
+    return sum(
+        evict_cached_covers(int(dir_name))
+        for dir_name in dir_names
+        if dir_name.isdigit() and int(dir_name) >= BENCH_ID_OFFSET
+    )
+
+
+def invalidate_caches() -> None:
+    invalidate_release_year_list()
+    invalidate_song_cards()
+    touch_song_data_updated_at()
@@ -0,0 +1,52 @@
+# hottrack/benchmarks/image_server.py
+
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Iterator
+
+from PIL import Image
+
+
+def make_png_bytes(size: int = 500, color: str = "steelblue") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (size, size), color).save(buffer, format="png")
+    return buffer.getvalue()
+
+
+@contextmanager
+def run_image_server(
+    host: str = "127.0.0.1", port: int = 0, latency: float = 0.0
+) -> Iterator[str]:
+    """모든 GET 요청에 같은 PNG 이미지로 응답하는 로컬 서버를 스레드로 실행하고, 기본 주소를 반환합니다.
+
+    외부 네트워크 없이 커버 이미지 다운로드를 측정하기 위해 사용합니다.
+    latency(초)를 지정하면 응답 전에 대기하여, 원격 서버의 응답 지연을 흉내냅니다.
+    """
+
+    png_bytes = make_png_bytes()
+
+    class ImageRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(png_bytes)))
+            self.end_headers()
+            self.wfile.write(png_bytes)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ImageRequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
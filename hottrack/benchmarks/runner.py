@@ -0,0 +1,173 @@
+# hottrack/benchmarks/runner.py
+
+import math
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    path: str
+    # 매 요청 전에 호출합니다. (측정 시간에서 제외, ex: 캐시 비우기)
+    setup: Optional[Callable[[], None]] = None
+    status_code: int = 200
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    path: str
+    repeat: int
+    # 응답 시간 (밀리초)
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    mean: float
+    # 요청 당 쿼리 수 (마지막 요청 기준)
+    query_count: int
+    # 요청 1회 처리 중의 최대 메모리 할당량 (KiB)
+    peak_memory_kib: float
+    response_bytes: int
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """정렬된 값들의 백분위수 (nearest-rank 방식)"""
+
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def make_client() -> Client:
+    # INTERNAL_IPS(127.0.0.1)가 아닌 주소로 요청하여, 디버그 툴바가 측정에 끼어들지 않도록 합니다.
+    return Client(HTTP_HOST="localhost", REMOTE_ADDR="192.0.2.1")
+
+
+def request(client: Client, case: BenchmarkCase) -> int:
+    """요청하고 응답 본문을 끝까지 읽어서, 응답 크기를 반환합니다."""
+
+    response = client.get(case.path)
+    if response.status_code != case.status_code:
+        raise AssertionError(
+            f"{case.path} responded {response.status_code}, "
+            f"{case.status_code} expected"
+        )
+
+    # 스트리밍 응답은 본문을 모두 읽어야 실제 처리 시간이 측정됩니다.
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+    response.close()
+    return size
+
+
+def run_case(
+    client: Client, case: BenchmarkCase, repeat: int = 20, warmup: int = 2
+) -> BenchmarkResult:
+    """warmup 횟수만큼 먼저 요청한 뒤, repeat 횟수만큼 요청하여 응답 시간을 측정합니다.
+
+    쿼리 수와 메모리는 측정 부하가 있으므로, 응답 시간 측정이 끝난 뒤 별도로 1회 요청하여 측정합니다.
+    """
+
+    for __ in range(warmup):
+        if case.setup:
+            case.setup()
+        request(client, case)
+
+    elapsed_list = []
+    response_bytes = 0
+    for __ in range(repeat):
+        if case.setup:
+            case.setup()
+        started_at = time.perf_counter()
+        response_bytes = request(client, case)
+        elapsed_list.append((time.perf_counter() - started_at) * 1000)
+
+    if case.setup:
+        case.setup()
+    with CaptureQueriesContext(connection) as context:
+        request(client, case)
+    query_count = len(context.captured_queries)
+
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    try:
+        request(client, case)
+        __, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    elapsed_list.sort()
+    return BenchmarkResult(
+        name=case.name,
+        path=case.path,
+        repeat=repeat,
+        p50=percentile(elapsed_list, 50),
+        p90=percentile(elapsed_list, 90),
+        p99=percentile(elapsed_list, 99),
+        max=elapsed_list[-1],
+        mean=sum(elapsed_list) / len(elapsed_list),
+        query_count=query_count,
+        peak_memory_kib=peak / 1024,
+        response_bytes=response_bytes,
+    )
+
+
+def run_cases(
+    cases: Sequence[BenchmarkCase], repeat: int = 20, warmup: int = 2
+) -> List[BenchmarkResult]:
+    client = make_client()
+    result_list = []
+    for case in cases:
+        try:
+            result = run_case(client, case, repeat=repeat, warmup=warmup)
+        except AssertionError as e:
+            result = BenchmarkResult(
+                name=case.name,
+                path=case.path,
+                repeat=0,
+                p50=0,
+                p90=0,
+                p99=0,
+                max=0,
+                mean=0,
+                query_count=0,
+                peak_memory_kib=0,
+                response_bytes=0,
+                errors=[str(e)],
+            )
+        result_list.append(result)
+    return result_list
+
+
+def format_results(result_list: Sequence[BenchmarkResult]) -> str:
+    header = (
+        f"{'case':<28} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} "
+        f"{'queries':>7} {'peak KiB':>10} {'bytes':>10}"
+    )
+    line_list = [header, "-" * len(header)]
+    for result in result_list:
+        if result.errors:
+            line_list.append(f"{result.name:<28} ERROR {'; '.join(result.errors)}")
+            continue
+        line_list.append(
+            f"{result.name:<28} {result.p50:>7.1f}ms {result.p90:>7.1f}ms "
+            f"{result.p99:>7.1f}ms {result.max:>7.1f}ms {result.query_count:>7} "
+            f"{result.peak_memory_kib:>10.1f} {result.response_bytes:>10}"
+        )
+    return "\n".join(line_list)
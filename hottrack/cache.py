@@ -0,0 +1,85 @@
+# hottrack/cache.py
+
+import time
+from typing import List
+
+from django.core.cache import cache
+
+RELEASE_YEAR_LIST_CACHE_KEY = "hottrack:release_year_list"
+RELEASE_YEAR_LIST_CACHE_TIMEOUT = 60 * 60
+
+SONG_CARD_VERSION_CACHE_KEY = "hottrack:song_card_version"
+
+SONG_DATA_UPDATED_AT_CACHE_KEY = "hottrack:song_data_updated_at"
+
+
+def get_release_year_list() -> List[int]:
+    """곡이 있는 발매 연도 목록을 최근 연도부터 반환합니다.
+
+    Song 테이블 대신 발매일별 곡 수(ReleaseDateCount)에서 집계하고, 그 결과를 캐싱합니다.
+    곡을 적재하면 invalidate_release_year_list()로 캐시를 지웁니다.
+    """
+
+    # hottrack.models 에서도 이 모듈을 사용하므로, 순환 참조를 피하기 위해 함수 안에서 임포트합니다.
+    from hottrack.models import ReleaseDateCount
+
+    year_list = cache.get(RELEASE_YEAR_LIST_CACHE_KEY)
+    if year_list is None:
+        year_list = [
+            release_year.year
+            for release_year in ReleaseDateCount.objects.dates(
+                "release_date", "year", order="DESC"
+            )
+        ]
+        cache.set(
+            RELEASE_YEAR_LIST_CACHE_KEY, year_list, RELEASE_YEAR_LIST_CACHE_TIMEOUT
+        )
+    return year_list
+
+
+def invalidate_release_year_list() -> None:
+    cache.delete(RELEASE_YEAR_LIST_CACHE_KEY)
+
+
+def get_song_card_version() -> int:
+    """_song.html 카드 조각 캐시의 버전을 반환합니다.
+
+    곡 정보가 바뀌면 invalidate_song_cards()로 버전을 올려서, 이전 버전의 조각 캐시를 사용하지 않습니다.
+    """
+
+    version = cache.get(SONG_CARD_VERSION_CACHE_KEY)
+    if version is None:
+        # 버전 값이 캐시에서 제거되었을 때 이전 버전으로 돌아가지 않도록, 현재 시각으로 시작합니다.
+        cache.add(SONG_CARD_VERSION_CACHE_KEY, int(time.time()), timeout=None)
+        version = cache.get(SONG_CARD_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_song_cards() -> None:
+    try:
+        cache.incr(SONG_CARD_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(SONG_CARD_VERSION_CACHE_KEY, int(time.time()), timeout=None)
+
+
+def get_song_data_updated_at() -> int:
+    """곡 데이터가 마지막으로 변경(적재/좋아요 수 갱신)된 시각을 epoch 초로 반환합니다.
+
+    hottrack 뷰의 Last-Modified/ETag 기준으로 사용합니다.
+    값이 캐시에 없으면 현재 시각을 기록하므로, 캐시가 비워진 직후에는 한 번씩 다시 응답합니다.
+    """
+
+    updated_at = cache.get(SONG_DATA_UPDATED_AT_CACHE_KEY)
+    if updated_at is None:
+        cache.add(SONG_DATA_UPDATED_AT_CACHE_KEY, int(time.time()), timeout=None)
+        updated_at = cache.get(SONG_DATA_UPDATED_AT_CACHE_KEY)
+    return updated_at
+
+
+def touch_song_data_updated_at() -> None:
+    updated_at = int(time.time())
+    # ETag가 초 단위 시각으로 정해지므로, 같은 초에 다시 변경되어도 이전 ETag와 겹치지 않도록 1초씩 올립니다.
+    previous_updated_at = cache.get(SONG_DATA_UPDATED_AT_CACHE_KEY)
+    if previous_updated_at is not None and previous_updated_at >= updated_at:
+        updated_at = previous_updated_at + 1
+    cache.set(SONG_DATA_UPDATED_AT_CACHE_KEY, updated_at, timeout=None)
@@ -1,9 +1,9 @@
 from typing import Optional, List
 
 from django.contrib import admin
-from django.db.models.functions import ExtractYear
 from django.utils import timezone
 
+from hottrack.cache import get_release_year_list
 from hottrack.models import Song
 
 
@@ -13,12 +13,8 @@ class ReleaseDateFilter(admin.SimpleListFilter):
     parameter_name = "release_date_filter"
 
     def lookups(self, request, model_admin):
-        year_list: List[int] = (
-            Song.objects.annotate(year=ExtractYear("release_date"))
-            .values_list("year", flat=True)
-            .order_by("-year")
-            .distinct()
-        )
+        # 매 요청마다 Song 테이블 전체에서 연도를 집계하지 않도록, 캐싱된 연도 목록을 사용합니다.
+        year_list: List[int] = get_release_year_list()
 
         fixed_lookups = [("this_month", "이번 달")]
 
@@ -0,0 +1,132 @@
+# hottrack/management/commands/bench_hottrack.py
+
+import json
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from hottrack.benchmarks.cases import get_default_cases
+from hottrack.benchmarks.generator import (
+    BENCH_ID_OFFSET,
+    CatalogueSize,
+    clear_catalogue,
+    generate_catalogue,
+)
+from hottrack.benchmarks.image_server import run_image_server
+from hottrack.benchmarks.runner import format_results, run_cases
+from hottrack.models import Song
+
+
+class Command(BaseCommand):
+    help = (
+        "가상 곡 데이터를 생성하고 hottrack 뷰 별 응답 시간/쿼리 수/최대 메모리를 측정합니다. "
+        f"측정용 레코드는 id {BENCH_ID_OFFSET} 이상으로 생성하며, 측정 후 삭제합니다. "
+        "측정용 데이터베이스/캐시를 사용하는 --settings=mysite.settings_bench 에서만 실행됩니다."
+    )
+
+    def add_arguments(self, parser):
+        default_size = CatalogueSize()
+        parser.add_argument("--artists", type=int, default=default_size.artists)
+        parser.add_argument("--albums", type=int, default=default_size.albums)
+        parser.add_argument("--genres", type=int, default=default_size.genres)
+        parser.add_argument("--songs", type=int, default=default_size.songs)
+        parser.add_argument(
+            "--genres-per-song", type=int, default=default_size.genres_per_song
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="같은 seed는 같은 데이터를 생성합니다."
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="항목 별 측정 횟수")
+        parser.add_argument(
+            "--warmup", type=int, default=2, help="항목 별 사전 요청 횟수"
+        )
+        parser.add_argument(
+            "--case",
+            dest="case_name_list",
+            action="append",
+            help="측정할 항목 이름 (여러 번 지정 가능, 디폴트: 전체)",
+        )
+        parser.add_argument(
+            "--image-port",
+            type=int,
+            default=8799,
+            help="로컬 이미지 서버 포트 (곡 커버 주소에 포함되므로, 생성 시와 같아야 합니다.)",
+        )
+        parser.add_argument(
+            "--image-latency",
+            type=float,
+            default=0.0,
+            help="이미지 서버의 응답 지연 (초)",
+        )
+        parser.add_argument(
+            "--skip-generate",
+            action="store_true",
+            help="이전에 --keep-data 로 남겨둔 측정용 데이터를 그대로 사용합니다.",
+        )
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            help="측정 후 데이터를 삭제하지 않습니다.",
+        )
+        parser.add_argument(
+            "--json", dest="json_path", help="측정 결과를 저장할 JSON 파일 경로"
+        )
+
+    def handle(self, *args, **options):
+        if not getattr(settings, "HOTTRACK_BENCHMARK", False):
+            raise CommandError(
+                "측정용 데이터를 생성/삭제하고 캐시를 무효화하므로, 측정용 설정에서만 실행할 수 있습니다. "
+                "(--settings=mysite.settings_bench)"
+            )
+        if options["repeat"] < 1:
+            raise CommandError("--repeat 는 1 이상이어야 합니다.")
+
+        with run_image_server(
+            port=options["image_port"], latency=options["image_latency"]
+        ) as image_server_url:
+            if not options["skip_generate"]:
+                size = CatalogueSize(
+                    artists=options["artists"],
+                    albums=options["albums"],
+                    genres=options["genres"],
+                    songs=options["songs"],
+                    genres_per_song=options["genres_per_song"],
+                )
+                clear_catalogue()
+                self.stdout.write(f"측정용 데이터를 생성합니다. {size}")
+                generate_catalogue(
+                    size, cover_url_base=image_server_url, seed=options["seed"]
+                )
+
+            song = Song.objects.filter(pk__gte=BENCH_ID_OFFSET).order_by("pk").first()
+            if song is None:
+                raise CommandError("측정용 데이터가 없습니다.")
+
+            case_list = get_default_cases(song)
+            if options["case_name_list"]:
+                case_list = [
+                    case for case in case_list if case.name in options["case_name_list"]
+                ]
+
+            try:
+                result_list = run_cases(
+                    case_list, repeat=options["repeat"], warmup=options["warmup"]
+                )
+            finally:
+                if not options["keep_data"]:
+                    deleted_count = clear_catalogue()
+                    self.stdout.write(f"측정용 곡 {deleted_count}개를 삭제했습니다.")
+
+        self.stdout.write(format_results(result_list))
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as f:
+                json.dump(
+                    [result.to_dict() for result in result_list],
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+
+        if any(result.errors for result in result_list):
+            raise CommandError("일부 항목의 측정에 실패했습니다.")
@@ -1,18 +1,48 @@
 # hottrack/management/commands/load_melon_songs.py
 
-import json
-from typing import List
-from urllib.request import urlopen
+import os
+import re
+from datetime import date
+from typing import Dict, List, Tuple
 
 from django.core.management import BaseCommand
+from django.db.models import QuerySet
+from django.db.models.functions import Upper
+from django.views.generic.dates import timezone_today
 
-from hottrack.models import Artist, Album, Genre, Song
+from hottrack.cache import (
+    invalidate_release_year_list,
+    invalidate_song_cards,
+    touch_song_data_updated_at,
+)
+from hottrack.models import (
+    Artist,
+    Album,
+    ChartEntry,
+    Genre,
+    ReleaseDateCount,
+    Song,
+)
+from hottrack.utils.jsonstream import iter_batches, iter_json_array, open_text_stream
 
 
 # melon_chart_url = "https://raw.githubusercontent.com/pyhub-kr/dump-data/main/melon/melon-20230910.json"
 # artist_uid, album_uid 필드가 추가되고, genre를 리스트화
 DEFAULT_MELON_CHART_URL = "https://raw.githubusercontent.com/pyhub-kr/dump-data/main/melon/melon-20240114.json"
 
+# 차트가 갱신될 때마다 함께 갱신할 Song 필드 목록
+SONG_UPDATE_FIELDS = [
+    "slug",
+    "rank",
+    "album",
+    "name",
+    "artist",
+    "cover_url",
+    "lyrics",
+    "release_date",
+    "like_count",
+]
+
 
 class Command(BaseCommand):
     help = "Load songs from melon chart"
@@ -20,40 +50,81 @@ class Command(BaseCommand):
     # 인자로 JSON 주소를 지정하지 않으면, 디폴트 주소를 활용
     def add_arguments(self, parser):
         parser.add_argument(
-            "melon_chart_url", nargs="?", default=DEFAULT_MELON_CHART_URL
+            "melon_chart_url",
+            nargs="?",
+            default=DEFAULT_MELON_CHART_URL,
+            help="차트 JSON 주소 혹은 로컬 파일 경로 (gzip 압축 지원)",
+        )
+        parser.add_argument(
+            "--chart-date",
+            type=date.fromisoformat,
+            default=None,
+            help="차트 일자 (YYYY-MM-DD). 미지정 시 파일명의 날짜(melon-YYYYMMDD.json), 없으면 오늘",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="한 번에 저장할 곡 수 (전체 JSON을 메모리에 올리지 않고 배치 단위로 처리)",
         )
 
     def handle(self, *args, **options):
         melon_chart_url = options["melon_chart_url"]
+        batch_size = options["batch_size"]
+        chart_date = options["chart_date"] or get_chart_date(melon_chart_url)
+        print(f"{chart_date} 일자의 차트를 저장합니다.")
 
-        json_string = urlopen(melon_chart_url).read().decode("utf-8")
-        orig_song_list = json.loads(json_string)
+        # JSON 배열을 원소 단위로 읽어서, batch_size 만큼씩 저장합니다.
+        with open_text_stream(melon_chart_url) as fp:
+            song_dict_iter = iter_json_array(fp)
+            for batch_no, orig_song_list in enumerate(
+                iter_batches(song_dict_iter, batch_size), start=1
+            ):
+                print(f"[batch {batch_no}] {len(orig_song_list)}곡을 처리합니다.")
+                load_songs(orig_song_list, chart_date)
 
-        create_foreign_data(orig_song_list)
 
-        # orig_song_list 내역을 토대로 데이터베이스에 없는 Song 레코드를 생성합니다.
-        song_id_set = set(Song.objects.values_list("id", flat=True).distinct())
+def get_chart_date(melon_chart_url: str) -> date:
+    """차트 주소/파일명에 포함된 날짜(melon-YYYYMMDD.json)를 반환합니다. 없으면 오늘 날짜입니다."""
 
-        song_list = []
-        for song_dict in orig_song_list:
-            song = Song.from_dict(song_dict)
-            if song.id not in song_id_set:
-                # 외래키 값으로 할당
-                song.artist_id = song_dict["artist_uid"]
-                song.album_id = song_dict["album_uid"]
-                song._genre_name_list = song_dict["장르"]
-                song_list.append(song)
-                song_id_set.add(song.id)
+    matched = re.search(r"(\d{4})(\d{2})(\d{2})", os.path.basename(melon_chart_url))
+    if matched:
+        try:
+            return date(*map(int, matched.groups()))
+        except ValueError:
+            pass
+    return timezone_today()
 
-        if song_list:
-            print(f"{len(song_list)}개의 곡을 생성합니다.")
-            Song.objects.bulk_create(song_list, batch_size=1000)
 
-            for song in song_list:
-                genre_qs = Genre.objects.filter(name__in=song._genre_name_list)
-                song.genre_set.add(*genre_qs)
-        else:
-            print("새롭게 등록할 곡이 없습니다.")
+def load_songs(orig_song_list: List[Dict], chart_date: date) -> List[Song]:
+    """
+    orig_song_list 내역을 Artist/Album/Genre/Song 순으로 upsert 합니다.
+    곡 수와 무관하게 단계마다 몇 개의 쿼리만 수행하며, 여러 번 실행해도 결과가 같습니다.
+    """
+
+    create_foreign_data(orig_song_list)
+
+    # 발매일이 바뀐 곡은 이전 발매일의 곡 수도 다시 집계해야 하므로, 갱신 전 발매일을 조회해둡니다.
+    song_pk_list = [orig_song["곡일련번호"] for orig_song in orig_song_list]
+    release_date_set = set(
+        Song.objects.filter(pk__in=song_pk_list)
+        .values_list("release_date", flat=True)
+        .distinct()
+    )
+
+    song_list = upsert_songs(orig_song_list)
+    add_song_genres(orig_song_list)
+    upsert_chart_entries(song_list, chart_date)
+
+    # bulk_create 에서는 save()가 호출되지 않으므로, 검색 컬럼과 발매일별 곡 수를 직접 갱신합니다.
+    Song.objects.filter(pk__in=[song.pk for song in song_list]).update_search_vector()
+    release_date_set.update(song.release_date for song in song_list)
+    ReleaseDateCount.refresh(release_date_set)
+    invalidate_release_year_list()
+    invalidate_song_cards()
+    touch_song_data_updated_at()
+
+    return song_list
 
 
 def create_foreign_data(orig_song_list):
@@ -61,50 +132,184 @@ def create_foreign_data(orig_song_list):
     orig_song_list 내역을 토대로 데이터베이스에 없는 Artist/Album/Genre 레코드를 생성합니다.
     """
 
-    artist_melon_uid_set = set(Artist.objects.values_list("id", flat=True).distinct())
-    album_melon_uid_set = set(Album.objects.values_list("id", flat=True).distinct())
-    genre_name_set = set(Genre.objects.values_list("name", flat=True).distinct())
-
-    artist_list: List[Artist] = []
-    album_list: List[Album] = []
-    genre_list: List[Genre] = []
+    artist_dict: Dict[int, str] = {}
+    album_dict: Dict[int, str] = {}
+    genre_name_set = set()
 
     for song_dict in orig_song_list:
-        if song_dict["artist_uid"] not in artist_melon_uid_set:
-            artist = Artist(
-                id=song_dict["artist_uid"],
-                name=song_dict["artist_name"],
-            )
-            artist_list.append(artist)
-            artist_melon_uid_set.add(song_dict["artist_uid"])
-
-        if song_dict["album_uid"] not in album_melon_uid_set:
-            album = Album(
-                id=song_dict["album_uid"],
-                name=song_dict["album_name"],
-            )
-            album_list.append(album)
-            album_melon_uid_set.add(song_dict["album_uid"])
-
-        for genre_name in set(song_dict["장르"]) - genre_name_set:
-            genre = Genre(name=genre_name)
-            genre_list.append(genre)
-            genre_name_set.update(song_dict["장르"])
+        artist_dict[song_dict["artist_uid"]] = song_dict["artist_name"]
+        album_dict[song_dict["album_uid"]] = song_dict["album_name"]
+        genre_name_set.update(song_dict["장르"])
 
+    # 전체 테이블이 아닌, 이번에 등록할 레코드 중에 이미 있는 레코드만 조회합니다.
+    artist_melon_uid_set = set(
+        Artist.objects.filter(pk__in=artist_dict).values_list("id", flat=True)
+    )
+    album_melon_uid_set = set(
+        Album.objects.filter(pk__in=album_dict).values_list("id", flat=True)
+    )
+    existed_genre_name_set = set(
+        filter_genres_by_name(genre_name_set).values_list("upper_name", flat=True)
+    )
+
+    artist_list: List[Artist] = [
+        Artist(id=artist_uid, name=artist_name)
+        for artist_uid, artist_name in artist_dict.items()
+        if artist_uid not in artist_melon_uid_set
+    ]
+    album_list: List[Album] = [
+        Album(id=album_uid, name=album_name)
+        for album_uid, album_name in album_dict.items()
+        if album_uid not in album_melon_uid_set
+    ]
+    # 대소문자만 다른 장르명은 하나만 생성합니다.
+    new_genre_name_dict = {
+        genre_name.upper(): genre_name
+        for genre_name in genre_name_set
+        if genre_name.upper() not in existed_genre_name_set
+    }
+    genre_list: List[Genre] = [
+        Genre(name=genre_name) for genre_name in new_genre_name_dict.values()
+    ]
+
+    # 동시에 실행된 다른 로딩 작업이 먼저 생성했더라도 오류가 나지 않도록 충돌은 무시합니다.
     if artist_list:
         print(f"{len(artist_list)}개의 가수를 생성합니다.")
-        Artist.objects.bulk_create(artist_list, batch_size=1000)
+        Artist.objects.bulk_create(artist_list, batch_size=1000, ignore_conflicts=True)
     else:
         print("새롭게 등록할 가수가 없습니다.")
 
     if album_list:
-        print(f"{len(album_list)}개의 가수를 생성합니다.")
-        Album.objects.bulk_create(album_list, batch_size=1000)
+        print(f"{len(album_list)}개의 앨범을 생성합니다.")
+        Album.objects.bulk_create(album_list, batch_size=1000, ignore_conflicts=True)
     else:
         print("새롭게 등록할 앨범이 없습니다.")
 
     if genre_list:
         print(f"{len(genre_list)}개의 장르를 생성합니다.")
-        Genre.objects.bulk_create(genre_list, batch_size=1000)
+        Genre.objects.bulk_create(genre_list, batch_size=1000, ignore_conflicts=True)
     else:
         print("새롭게 등록할 장르가 없습니다.")
+
+
+def filter_genres_by_name(genre_name_set) -> QuerySet[Genre]:
+    """장르명 유일성 제약(Upper)의 인덱스를 타도록, 대문자 장르명으로 조회합니다."""
+
+    return Genre.objects.annotate(upper_name=Upper("name")).filter(
+        upper_name__in={name.upper() for name in genre_name_set}
+    )
+
+
+def upsert_songs(orig_song_list: List[Dict]) -> List[Song]:
+    """
+    orig_song_list 내역으로 Song 레코드를 생성하고, 이미 있는 곡은 순위/좋아요 수 등을 갱신합니다.
+    """
+
+    song_dict: Dict[int, Song] = {}
+    for orig_song in orig_song_list:
+        song = Song.from_dict(orig_song)
+        # 외래키 값으로 할당
+        song.artist_id = orig_song["artist_uid"]
+        song.album_id = orig_song["album_uid"]
+        # 같은 곡이 중복되면, 나중 값을 사용합니다.
+        song_dict[song.id] = song
+
+    song_list = list(song_dict.values())
+    assign_unique_slugs(song_list)
+
+    if song_list:
+        existed_count = Song.objects.filter(pk__in=song_dict).count()
+        print(
+            f"{len(song_list) - existed_count}개의 곡을 생성하고, "
+            f"{existed_count}개의 곡을 갱신합니다."
+        )
+        Song.objects.bulk_create(
+            song_list,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=SONG_UPDATE_FIELDS,
+        )
+    else:
+        print("새롭게 등록할 곡이 없습니다.")
+
+    return song_list
+
+
+def assign_unique_slugs(song_list: List[Song]) -> None:
+    """같은 발매일에 같은 slug의 곡이 있으면, slug 뒤에 곡 id를 붙여 발매일 별로 유일하게 만듭니다.
+
+    이미 그 slug를 사용 중인 곡이 slug를 유지하므로, 여러 번 적재해도 곡의 주소가 바뀌지 않습니다.
+    """
+
+    if not song_list:
+        return
+
+    # (발매일, slug) : 곡 id
+    owner_dict: Dict[Tuple[date, str], int] = {
+        (release_date, slug): song_id
+        for song_id, release_date, slug in Song.objects.filter(
+            release_date__in={song.release_date for song in song_list},
+            slug__in={song.slug for song in song_list},
+        ).values_list("id", "release_date", "slug")
+    }
+
+    def sort_key(song: Song):
+        # slug를 이미 사용 중인 곡부터, 그 다음은 id 순으로 slug를 할당합니다.
+        is_owner = owner_dict.get((song.release_date, song.slug)) == song.id
+        return not is_owner, song.id
+
+    for song in sorted(song_list, key=sort_key):
+        owner_id = owner_dict.get((song.release_date, song.slug))
+        if owner_id is not None and owner_id != song.id:
+            song.slug = song.get_slug_with_suffix()
+        owner_dict[(song.release_date, song.slug)] = song.id
+
+
+def add_song_genres(orig_song_list: List[Dict]) -> None:
+    """곡-장르 관계를 한 번의 bulk_create로 추가합니다. (이미 있는 관계는 무시)"""
+
+    genre_name_set = set()
+    for orig_song in orig_song_list:
+        genre_name_set.update(orig_song["장르"])
+
+    # 장르명 유일성 제약이 대소문자를 구분하지 않으므로, 대문자로 매핑합니다.
+    genre_id_dict: Dict[str, int] = dict(
+        filter_genres_by_name(genre_name_set).values_list("upper_name", "id")
+    )
+
+    SongGenre = Song.genre_set.through
+    song_genre_list = [
+        SongGenre(song_id=orig_song["곡일련번호"], genre_id=genre_id_dict[name.upper()])
+        for orig_song in orig_song_list
+        for name in set(orig_song["장르"])
+        if name.upper() in genre_id_dict
+    ]
+
+    if song_genre_list:
+        SongGenre.objects.bulk_create(
+            song_genre_list, batch_size=1000, ignore_conflicts=True
+        )
+
+
+def upsert_chart_entries(song_list: List[Song], chart_date: date) -> None:
+    """차트 일자의 곡별 순위/좋아요 수를 기록합니다. 같은 일자를 다시 로딩하면 갱신합니다."""
+
+    chart_entry_list = [
+        ChartEntry(
+            song_id=song.id,
+            chart_date=chart_date,
+            rank=song.rank,
+            like_count=song.like_count,
+        )
+        for song in song_list
+    ]
+
+    if chart_entry_list:
+        ChartEntry.objects.bulk_create(
+            chart_entry_list,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["song", "chart_date"],
+            update_fields=["rank", "like_count"],
+        )
@@ -0,0 +1,16 @@
+# hottrack/management/commands/rebuild_release_date_counts.py
+
+from django.core.management import BaseCommand
+
+from hottrack.models import ReleaseDateCount
+
+
+class Command(BaseCommand):
+    help = (
+        "발매일별 곡 수(ReleaseDateCount)를 곡 테이블 전체로부터 다시 집계합니다. "
+        "save()/delete()를 거치지 않고 곡을 변경/삭제한 경우에 실행해주세요."
+    )
+
+    def handle(self, *args, **options):
+        release_date_count = ReleaseDateCount.rebuild()
+        self.stdout.write(f"{release_date_count}개 발매일의 곡 수를 집계했습니다.")
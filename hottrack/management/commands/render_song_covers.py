@@ -0,0 +1,96 @@
+# hottrack/management/commands/render_song_covers.py
+
+import multiprocessing
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import List, Tuple
+
+from django.core.management import BaseCommand
+
+from hottrack.models import Song
+from hottrack.utils.cover import COVER_SIZES, render_cached_covers
+
+
+class Command(BaseCommand):
+    help = "곡 커버 이미지를 크기별로 미리 렌더링하여 미디어 스토리지에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            dest="size_list",
+            type=int,
+            action="append",
+            choices=COVER_SIZES,
+            help="렌더링할 크기 (여러 번 지정 가능, 디폴트: 모든 크기)",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None, help="프로세스 수 (디폴트: CPU 수)"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=200, help="프로세스에 넘길 곡 수"
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="이미 렌더링된 이미지도 삭제하고 다시 렌더링합니다.",
+        )
+
+    def handle(self, *args, **options):
+        canvas_sizes = tuple(sorted(set(options["size_list"] or COVER_SIZES)))
+        batch_size = options["batch_size"]
+        force = options["force"]
+
+        max_workers = options["workers"] or os.cpu_count() or 1
+
+        # (렌더링 수, 건너뛴 수, 다운로드 실패 수)
+        counts = [0, 0, 0]
+
+        def collect(future_set):
+            for future in future_set:
+                for i, count in enumerate(future.result()):
+                    counts[i] += count
+
+        # fork 방식은 부모 프로세스의 DB 연결을 물려받으므로, 새 인터프리터로 프로세스를 띄웁니다.
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers, mp_context=mp_context) as executor:
+            # 조회한 곡 목록이 메모리에 계속 쌓이지 않도록, 처리 중인 배치 수를 제한합니다.
+            pending = set()
+            for song_list in iter_song_batches(batch_size):
+                pending.add(
+                    executor.submit(
+                        render_cached_covers, song_list, canvas_sizes, force
+                    )
+                )
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            collect(as_completed(pending))
+
+        rendered_count, skipped_count, failed_count = counts
+        self.stdout.write(
+            f"{rendered_count}개의 커버 이미지를 렌더링했습니다. "
+            f"(건너뜀: {skipped_count}, 다운로드 실패: {failed_count})"
+        )
+
+
+def iter_song_batches(batch_size: int):
+    """id 순으로 (곡 id, 커버 주소, 가수명) 목록을 batch_size 만큼씩 조회합니다."""
+
+    last_id = 0
+    while True:
+        song_list: List[Tuple[int, str, str]] = list(
+            Song.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("id", "cover_url", "artist__name")[:batch_size]
+        )
+        if not song_list:
+            break
+
+        yield song_list
+        last_id = song_list[-1][0]
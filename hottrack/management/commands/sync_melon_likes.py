@@ -0,0 +1,114 @@
+# hottrack/management/commands/sync_melon_likes.py
+
+import datetime
+import time
+from typing import Dict, Iterator, Optional
+
+from django.core.management import BaseCommand, CommandError
+
+from hottrack.models import Song
+
+
+class Command(BaseCommand):
+    help = "멜론 좋아요 수를 조회하여, 변경된 곡의 좋아요 수만 갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=datetime.date.fromisoformat,
+            help="지정 발매일(YYYY-MM-DD) 이후의 곡만 갱신합니다.",
+        )
+        parser.add_argument("--limit", type=int, default=None, help="갱신할 최대 곡 수")
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="한 번에 조회할 곡 수"
+        )
+        parser.add_argument(
+            "--workers", type=int, default=4, help="동시에 보낼 멜론 요청 수"
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=None,
+            help="지정 초마다 반복 실행합니다. (미지정 시 1회 실행)",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+
+        while True:
+            self.sync(
+                since=options["since"],
+                limit=options["limit"],
+                batch_size=options["batch_size"],
+                max_workers=options["workers"],
+            )
+
+            if options["interval"] is None:
+                break
+            time.sleep(options["interval"])
+
+    def sync(
+        self,
+        since: Optional[datetime.date],
+        limit: Optional[int],
+        batch_size: int,
+        max_workers: int,
+    ) -> None:
+        started_at = time.monotonic()
+        scanned_count = changed_count = 0
+
+        for batch_no, like_count_dict in enumerate(
+            iter_like_count_batches(since, limit, batch_size), start=1
+        ):
+            batch_started_at = time.monotonic()
+            changed_song_list = Song.sync_like_count_dict(
+                like_count_dict, max_workers=max_workers
+            )
+            batch_elapsed = time.monotonic() - batch_started_at
+
+            scanned_count += len(like_count_dict)
+            changed_count += len(changed_song_list)
+            self.stdout.write(
+                f"[batch {batch_no}] {len(like_count_dict)}곡 조회, "
+                f"{len(changed_song_list)}곡 갱신 ({batch_elapsed:.2f}초)"
+            )
+
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{scanned_count}곡 중 {changed_count}곡의 좋아요 수를 갱신했습니다. "
+                f"({elapsed:.2f}초)"
+            )
+        )
+
+
+def iter_like_count_batches(
+    since: Optional[datetime.date], limit: Optional[int], batch_size: int
+) -> Iterator[Dict[int, int]]:
+    """id 기준 키셋 페이지네이션으로 {곡 id: 좋아요 수} 사전을 batch_size 만큼씩 반환합니다.
+
+    OFFSET 없이 마지막 id 이후부터 조회하므로, 뒤쪽 배치도 앞쪽 배치와 같은 비용으로 조회합니다.
+    """
+
+    song_qs = Song.objects.order_by("pk")
+    if since is not None:
+        song_qs = song_qs.filter(release_date__gte=since)
+
+    last_id = 0
+    remaining_count = limit
+    while remaining_count is None or remaining_count > 0:
+        size = (
+            batch_size if remaining_count is None else min(batch_size, remaining_count)
+        )
+        like_count_list = list(
+            song_qs.filter(pk__gt=last_id).values_list("id", "like_count")[:size]
+        )
+        if not like_count_list:
+            break
+
+        yield dict(like_count_list)
+
+        last_id = like_count_list[-1][0]
+        if remaining_count is not None:
+            remaining_count -= len(like_count_list)
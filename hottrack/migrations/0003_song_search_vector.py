@@ -0,0 +1,52 @@
+# Generated by Django 4.2.13 on 2026-10-18 05:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def update_search_vector(apps, schema_editor):
+    Song = apps.get_model("hottrack", "Song")
+    Artist = apps.get_model("hottrack", "Artist")
+    Album = apps.get_model("hottrack", "Album")
+
+    artist_name = Subquery(
+        Artist.objects.filter(pk=OuterRef("artist_id")).values("name")[:1]
+    )
+    album_name = Subquery(
+        Album.objects.filter(pk=OuterRef("album_id")).values("name")[:1]
+    )
+
+    Song.objects.update(
+        search_vector=(
+            SearchVector("name", weight="A", config="simple")
+            + SearchVector(artist_name, weight="B", config="simple")
+            + SearchVector(album_name, weight="C", config="simple")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hottrack", "0002_comment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="song",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="song",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="hottrack_song_search_idx"
+            ),
+        ),
+        migrations.RunPython(update_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.13 on 2026-10-18 05:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hottrack", "0003_song_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChartEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("chart_date", models.DateField(verbose_name="차트 일자")),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("like_count", models.PositiveIntegerField()),
+                (
+                    "song",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="hottrack.song",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["chart_date", "rank"],
+                        name="hottrack_chartentry_date_rank",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="chartentry",
+            constraint=models.UniqueConstraint(
+                fields=("song", "chart_date"),
+                name="hottrack_chartentry_song_date_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.13 on 2026-10-18 05:51
+
+from django.db import migrations, models
+
+
+def populate_release_date_count(apps, schema_editor):
+    Song = apps.get_model("hottrack", "Song")
+    ReleaseDateCount = apps.get_model("hottrack", "ReleaseDateCount")
+
+    ReleaseDateCount.objects.bulk_create(
+        [
+            ReleaseDateCount(release_date=release_date, song_count=song_count)
+            for release_date, song_count in Song.objects.filter(
+                release_date__isnull=False
+            )
+            .values("release_date")
+            .annotate(song_count=models.Count("id"))
+            .values_list("release_date", "song_count")
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hottrack", "0004_chartentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReleaseDateCount",
+            fields=[
+                (
+                    "release_date",
+                    models.DateField(
+                        primary_key=True, serialize=False, verbose_name="발매일"
+                    ),
+                ),
+                ("song_count", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.RunPython(populate_release_date_count, migrations.RunPython.noop),
+    ]
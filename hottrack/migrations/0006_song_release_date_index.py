@@ -0,0 +1,18 @@
+# Generated by Django 4.2.13 on 2026-10-18 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hottrack", "0005_releasedatecount"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="song",
+            name="release_date",
+            field=models.DateField(db_index=True, verbose_name="발매일"),
+        ),
+    ]
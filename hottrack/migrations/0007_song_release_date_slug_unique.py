@@ -0,0 +1,48 @@
+# Generated by Django 4.2.13 on 2026-10-18 06:00
+
+from django.db import migrations, models
+import django.db.models.constraints
+
+
+def dedupe_song_slugs(apps, schema_editor):
+    """같은 발매일에 같은 slug인 곡들 중 id가 가장 작은 곡을 제외하고, slug 뒤에 곡 id를 붙입니다."""
+
+    Song = apps.get_model("hottrack", "Song")
+    slug_max_length = Song._meta.get_field("slug").max_length
+
+    duplicated_qs = (
+        Song.objects.values("release_date", "slug")
+        .annotate(song_count=models.Count("id"))
+        .filter(song_count__gt=1)
+    )
+
+    changed_song_list = []
+    for duplicated in duplicated_qs:
+        song_qs = Song.objects.filter(
+            release_date=duplicated["release_date"], slug=duplicated["slug"]
+        ).order_by("id")
+        for song in song_qs.only("id", "slug")[1:]:
+            suffix = f"-{song.id}"
+            song.slug = song.slug[: slug_max_length - len(suffix)] + suffix
+            changed_song_list.append(song)
+
+    Song.objects.bulk_update(changed_song_list, fields=["slug"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hottrack", "0006_song_release_date_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_song_slugs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="song",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["IMMEDIATE"],
+                fields=("release_date", "slug"),
+                name="hottrack_song_release_date_slug_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.13 on 2026-10-18 06:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hottrack", "0007_song_release_date_slug_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="song",
+            name="release_date",
+            field=models.DateField(verbose_name="발매일"),
+        ),
+    ]
@@ -1,3 +1,19 @@
+from typing import Optional, Sequence
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import Http404
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+from django.views.generic.dates import timezone_today
+
+from core.paginator import CursorPaginator, InvalidCursor
+from hottrack.cache import get_song_data_updated_at
+
+
 class SearchQueryMixin:
     query = None
 
@@ -11,3 +27,227 @@ class SearchQueryMixin:
         context_data = super().get_context_data(**kwargs)
         context_data["query"] = self.query
         return context_data
+
+
+class QueryPlanMixin:
+    """템플릿/목록에서 사용할 관계와 필드를 선언하여, N+1 쿼리 없이 조회합니다.
+
+    뷰(get_queryset())와 ModelAdmin(get_queryset(request)) 모두에 사용할 수 있습니다.
+    """
+
+    # 정방향 관계 (ForeignKey/OneToOneField) : JOIN 으로 함께 조회
+    query_select_related: Sequence[str] = ()
+    # 역방향/다대다 관계 : 관계 별로 1번의 추가 쿼리로 조회
+    query_prefetch_related: Sequence = ()
+    # 조회할 필드 목록 (None 이면 전체 필드). select_related 관계의 필드는 "artist__name" 처럼 지정합니다.
+    query_only: Optional[Sequence[str]] = None
+
+    def apply_query_plan(self, queryset):
+        if self.query_select_related:
+            queryset = queryset.select_related(*self.query_select_related)
+        if self.query_prefetch_related:
+            queryset = queryset.prefetch_related(*self.query_prefetch_related)
+        if self.query_only is not None:
+            queryset = queryset.only(*self.query_only)
+        return queryset
+
+    def get_queryset(self, *args, **kwargs):
+        queryset = super().get_queryset(*args, **kwargs)
+        return self.apply_query_plan(queryset)
+
+
+class CursorPaginationMixin:
+    """ListView/ArchiveIndexView의 OFFSET 페이지네이션을 커서(키셋) 페이지네이션으로 대체합니다.
+
+    cursor_ordering의 마지막 필드는 기본키처럼 유일한 필드여야 합니다.
+    """
+
+    cursor_ordering = ("-id",)
+    cursor_kwarg = "cursor"
+    # None (개수 조회 안 함), "estimated" (실행 계획의 예상 행 수), "exact" (COUNT 쿼리)
+    cursor_count_mode = None
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            ordering=self.get_cursor_ordering(),
+            count_mode=self.cursor_count_mode,
+        )
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    # 페이지 링크에서 현재 검색 조건을 유지할 수 있도록, 커서를 제외한 Query Parameter를 저장합니다.
+    def get_context_data(self, **kwargs):
+        context_data = super().get_context_data(**kwargs)
+        query_dict = self.request.GET.copy()
+        query_dict.pop(self.cursor_kwarg, None)
+        context_data["pagination_querystring"] = query_dict.urlencode()
+        return context_data
+
+
+class DateHistogramMixin:
+    """날짜 기반 뷰의 date_list 와 이전/다음 기간 조회를 날짜별 집계 모델에서 수행합니다.
+
+    원본 테이블 전체를 날짜 단위로 절삭/DISTINCT 하지 않고, 날짜 수 만큼의 작은 테이블만 조회합니다.
+    집계 모델에는 date_field 와 같은 이름의 날짜 필드가 있어야 합니다.
+    """
+
+    histogram_model = None
+
+    def get_histogram_queryset(self):
+        if self.histogram_model is None:
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} is missing a histogram_model."
+            )
+
+        qs = self.histogram_model._default_manager.all()
+        if not self.get_allow_future():
+            date_field = self.get_date_field()
+            qs = qs.filter(**{f"{date_field}__lte": timezone_today()})
+        return qs
+
+    # date_list 를 같은 기간 조건으로 조회할 수 있도록, 기간 조건을 저장해둡니다.
+    def get_dated_queryset(self, **lookup):
+        self.dated_lookup = lookup
+        return super().get_dated_queryset(**lookup)
+
+    def get_date_list(self, queryset, date_type=None, ordering="ASC"):
+        date_field = self.get_date_field()
+        if date_type is None:
+            date_type = self.get_date_list_period()
+
+        qs = self.get_histogram_queryset().filter(**getattr(self, "dated_lookup", {}))
+        date_list = qs.dates(date_field, date_type, ordering)
+        if not date_list and not self.get_allow_empty():
+            raise Http404(f"No {queryset.model._meta.verbose_name_plural} available")
+        return date_list
+
+    def get_next_year(self, date):
+        return self._get_next_prev_from_histogram(date, False, "year")
+
+    def get_previous_year(self, date):
+        return self._get_next_prev_from_histogram(date, True, "year")
+
+    def get_next_month(self, date):
+        return self._get_next_prev_from_histogram(date, False, "month")
+
+    def get_previous_month(self, date):
+        return self._get_next_prev_from_histogram(date, True, "month")
+
+    def get_next_week(self, date):
+        return self._get_next_prev_from_histogram(date, False, "week")
+
+    def get_previous_week(self, date):
+        return self._get_next_prev_from_histogram(date, True, "week")
+
+    def get_next_day(self, date):
+        return self._get_next_prev_from_histogram(date, False, "day")
+
+    def get_previous_day(self, date):
+        return self._get_next_prev_from_histogram(date, True, "day")
+
+    def _get_next_prev_from_histogram(self, date, is_previous, period):
+        """빈 기간을 건너뛰고, 데이터가 있는 이전/다음 기간의 시작일을 반환합니다."""
+
+        # allow_empty 이면 장고 기본 구현도 데이터베이스를 조회하지 않습니다.
+        if self.get_allow_empty():
+            prefix = "previous" if is_previous else "next"
+            return getattr(super(), f"get_{prefix}_{period}")(date)
+
+        get_current = getattr(self, f"_get_current_{period}")
+        get_next = getattr(self, f"_get_next_{period}")
+        date_field = self.get_date_field()
+
+        qs = self.get_histogram_queryset()
+        if is_previous:
+            qs = qs.filter(**{f"{date_field}__lt": get_current(date)})
+            qs = qs.order_by(f"-{date_field}")
+        else:
+            qs = qs.filter(**{f"{date_field}__gte": get_next(date)})
+            qs = qs.order_by(date_field)
+
+        found_date = qs.values_list(date_field, flat=True).first()
+        if found_date is None:
+            return None
+        return get_current(found_date)
+
+
+class ConditionalGetMixin:
+    """GET/HEAD 요청에 Last-Modified/ETag/Cache-Control 헤더를 지정하고, 변경이 없으면 304 응답합니다.
+
+    get_last_modified()로 데이터의 마지막 변경 시각(epoch 초)을 반환하면,
+    쿼리와 템플릿 렌더링 없이 브라우저/CDN 캐시의 유효성을 확인할 수 있습니다.
+
+    ETag/Last-Modified는 데이터 변경 시각만으로 정해지므로, 로그인 사용자에게는 조건부 응답을 하지 않습니다.
+    (로그인 사용자의 페이지에는 사용자 정보와 CSRF 토큰이 포함되어, 익명 사용자의 ETag로 304 응답하면
+    이전 페이지가 그대로 보여지게 됩니다.) 사용자와 무관한 응답이라면 conditional_for_authenticated 를 켜주세요.
+    """
+
+    # 익명 사용자 응답은 CDN 등 공유 캐시에도 저장할 수 있습니다.
+    cache_max_age = 60
+    shared_cache_max_age = 60 * 10
+    conditional_for_authenticated = False
+
+    def get_last_modified(self) -> Optional[int]:
+        return None
+
+    def get_etag(self, last_modified: int) -> str:
+        return quote_etag(f"{self.__class__.__name__}-{last_modified}")
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        if request.user.is_authenticated and not self.conditional_for_authenticated:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                self.patch_cache_headers(request, response)
+            return response
+
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = self.get_etag(last_modified)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            response.headers.setdefault("Last-Modified", http_date(last_modified))
+            self.patch_cache_headers(request, response)
+        return response
+
+    def patch_cache_headers(self, request, response) -> None:
+        if not request.user.is_authenticated:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=self.cache_max_age,
+                s_maxage=self.shared_cache_max_age,
+            )
+        elif self.conditional_for_authenticated:
+            patch_cache_control(response, private=True, max_age=self.cache_max_age)
+        else:
+            # 검증할 ETag가 없으므로, 매번 새로 요청하도록 합니다.
+            patch_cache_control(response, private=True, no_cache=True)
+        # 로그인 여부에 따라 응답이 달라질 수 있으므로, 쿠키 별로 캐싱합니다.
+        patch_vary_headers(response, ("Cookie",))
+
+
+class SongConditionalGetMixin(ConditionalGetMixin):
+    """곡 데이터가 마지막으로 적재/갱신된 시각을 기준으로 조건부 응답합니다."""
+
+    def get_last_modified(self):
+        return get_song_data_updated_at()
@@ -2,20 +2,53 @@
 
 from __future__ import annotations
 
+import re
 from datetime import date
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
 from urllib.parse import quote
 
-from django.db import models
-from django.db.models.functions import Upper
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
+from django.db import models, transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Upper
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.text import slugify
 
+from hottrack.cache import (
+    invalidate_release_year_list,
+    invalidate_song_cards,
+    touch_song_data_updated_at,
+)
+from hottrack.utils.melon import (
+    aget_likes_dict_concurrently,
+    get_likes_dict_concurrently,
+)
 from mysite import settings
 
 
-class Artist(models.Model):
+class SongSearchSourceMixin:
+    """이름이 바뀌면, 관련 곡들의 검색 벡터(Song.search_vector)를 다시 계산합니다."""
+
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if not is_new and (update_fields is None or "name" in update_fields):
+            self.song_set.update_search_vector()
+            invalidate_song_cards()
+            touch_song_data_updated_at()
+
+
+class Artist(SongSearchSourceMixin, models.Model):
     id = models.PositiveIntegerField(primary_key=True)
     name = models.CharField(max_length=100)
 
@@ -23,7 +56,7 @@ class Artist(models.Model):
         return self.name
 
 
-class Album(models.Model):
+class Album(SongSearchSourceMixin, models.Model):
     id = models.PositiveIntegerField(primary_key=True)
     name = models.CharField(max_length=100)
 
@@ -46,6 +79,94 @@ class Genre(models.Model):
         ]
 
 
+class SongQuerySet(models.QuerySet):
+    # 한글 형태소 분석기가 없으므로, 공백 단위로 토큰을 나누는 simple 설정을 사용합니다.
+    search_config = "simple"
+
+    def search(self, query: str):
+        """곡명/가수명/앨범명에 대한 전문 검색 (검색어 입력 중에도 매칭되도록 접두어 검색)"""
+
+        # tsquery 문법에 쓰이는 특수문자(&, |, !, :, 괄호 등)를 제거하고 단어만 남깁니다.
+        word_list = re.findall(r"\w+", query)
+        if not word_list:
+            return self.none()
+
+        raw_query = " & ".join(f"{word}:*" for word in word_list)
+        search_query = SearchQuery(
+            raw_query, config=self.search_config, search_type="raw"
+        )
+
+        return (
+            self.filter(search_vector=search_query)
+            # ts_rank의 real 타입 값은 커서 페이지네이션 비교 시에 오차가 생기므로, double로 변환합니다.
+            .annotate(
+                search_rank=Cast(
+                    SearchRank(F("search_vector"), search_query), FloatField()
+                )
+            ).order_by("-search_rank", "rank", "id")
+        )
+
+    def update_search_vector(self) -> int:
+        """search_vector 필드를 곡명(A), 가수명(B), 앨범명(C) 가중치로 갱신합니다."""
+
+        # UPDATE 쿼리에서는 JOIN을 쓸 수 없기에, 가수명/앨범명은 서브쿼리로 조회합니다.
+        artist_name = Subquery(
+            Artist.objects.filter(pk=OuterRef("artist_id")).values("name")[:1]
+        )
+        album_name = Subquery(
+            Album.objects.filter(pk=OuterRef("album_id")).values("name")[:1]
+        )
+
+        return self.update(
+            search_vector=self.get_search_vector("name", artist_name, album_name)
+        )
+
+    @classmethod
+    def get_search_vector(cls, name, artist_name, album_name) -> SearchVector:
+        """곡명(A), 가수명(B), 앨범명(C) 가중치의 검색 벡터 표현식"""
+
+        return (
+            SearchVector(name, weight="A", config=cls.search_config)
+            + SearchVector(artist_name, weight="B", config=cls.search_config)
+            + SearchVector(album_name, weight="C", config=cls.search_config)
+        )
+
+    def delete(self):
+        # 삭제할 곡들의 발매일을 먼저 조회해두고, 삭제 후에 발매일별 곡 수를 다시 집계합니다.
+        release_date_list = list(
+            self.order_by().values_list("release_date", flat=True).distinct()
+        )
+        result = super().delete()
+        ReleaseDateCount.refresh(release_date_list)
+        invalidate_song_cards()
+        touch_song_data_updated_at()
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def update_like_count(self, max_workers: int = 4) -> int:
+        """멜론에서 좋아요 수를 조회하여, 변경된 곡만 갱신하고 갱신한 곡 수를 반환합니다."""
+
+        like_count_dict: Dict[int, int] = dict(self.values_list("id", "like_count"))
+        changed_song_list = Song.sync_like_count_dict(
+            like_count_dict, max_workers=max_workers
+        )
+        return len(changed_song_list)
+
+    async def aupdate_like_count(self, max_concurrency: int = 4) -> int:
+        """update_like_count의 비동기 버전"""
+
+        like_count_dict: Dict[int, int] = {
+            song_id: like_count
+            async for song_id, like_count in self.values_list("id", "like_count")
+        }
+        changed_song_list = await Song.async_like_count_dict(
+            like_count_dict, max_concurrency=max_concurrency
+        )
+        return len(changed_song_list)
+
+
 class Song(models.Model):
     id = models.PositiveIntegerField(primary_key=True)
     slug = models.SlugField(max_length=100, allow_unicode=True, blank=True)
@@ -60,14 +181,75 @@ class Song(models.Model):
     release_date = models.DateField(verbose_name="발매일")
     like_count = models.PositiveIntegerField()
 
+    # 곡명/가수명/앨범명 전문 검색을 위한 컬럼
+    # save() 시와 가수/앨범명 변경 시에 갱신되며, bulk_create/update() 등 save()를 거치지 않고
+    # 변경한 경우에는 SongQuerySet.update_search_vector() 로 다시 계산해주세요.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = SongQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=["slug"]),
+            GinIndex(fields=["search_vector"], name="hottrack_song_search_idx"),
+        ]
+        constraints = [
+            # 상세 페이지 주소(/<발매일>/<slug>/)로 곡을 찾으므로, 발매일 별로 slug가 유일해야 합니다.
+            # 복합 인덱스로 상세 페이지 조회에도 사용합니다.
+            # 한 번의 bulk upsert 안에서 곡끼리 slug를 주고받을 수 있도록, 문장 단위로 검사합니다.
+            models.UniqueConstraint(
+                fields=["release_date", "slug"],
+                name="hottrack_song_release_date_slug_unique",
+                deferrable=models.Deferrable.IMMEDIATE,
+            ),
         ]
 
     def save(self, *args, **kwargs):
         self.slugify()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            # 검색 벡터의 원본 필드를 저장할 때에는, 검색 벡터도 함께 저장합니다.
+            if {"name", "artist", "artist_id", "album", "album_id"} & update_fields:
+                update_fields.add("search_vector")
+            kwargs["update_fields"] = update_fields
+        if update_fields is None or {"release_date", "slug"} & update_fields:
+            self.make_slug_unique()
+        # 검색 벡터를 별도 UPDATE 없이, 같은 INSERT/UPDATE 문에서 계산합니다.
+        self.search_vector = SongQuerySet.get_search_vector(
+            Value(self.name),
+            Subquery(Artist.objects.filter(pk=self.artist_id).values("name")[:1]),
+            Subquery(Album.objects.filter(pk=self.album_id).values("name")[:1]),
+        )
+        is_new = self._state.adding
         super().save(*args, **kwargs)
+        # 인스턴스에는 계산된 값 대신 표현식이 남아있으므로, 접근 시에 다시 조회하도록 합니다.
+        del self.search_vector
+
+        # 새 곡이거나 발매일이 바뀌었다면, 이전/현재 발매일의 곡 수를 다시 집계합니다.
+        loaded_release_date = getattr(self, "_loaded_release_date", None)
+        if is_new or loaded_release_date != self.release_date:
+            if update_fields is None or "release_date" in update_fields:
+                ReleaseDateCount.refresh([loaded_release_date, self.release_date])
+                self._loaded_release_date = self.release_date
+
+        # 곡 카드 조각 캐시와 목록/상세 페이지의 Last-Modified 기준 시각을 갱신합니다.
+        invalidate_song_cards()
+        touch_song_data_updated_at()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        ReleaseDateCount.refresh([self.release_date])
+        invalidate_song_cards()
+        touch_song_data_updated_at()
+        return result
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 발매일이 바뀌었을 때 이전 발매일의 곡 수도 갱신할 수 있도록, 조회한 값을 기억해둡니다.
+        instance._loaded_release_date = instance.__dict__.get("release_date")
+        return instance
 
     def slugify(self, force=False):
         if force or not self.slug:
@@ -76,6 +258,28 @@ class Song(models.Model):
             slug_max_length = self._meta.get_field("slug").max_length
             self.slug = self.slug[:slug_max_length]
 
+    def make_slug_unique(self) -> None:
+        """같은 발매일에 같은 slug의 다른 곡이 있다면, 곡 id를 붙인 slug로 변경합니다.
+
+        (release_date, slug) 유일 제약의 복합 인덱스로 조회합니다.
+        여러 곡을 한 번에 적재할 때에는 load_melon_songs 명령의 assign_unique_slugs()를 사용합니다.
+        """
+
+        is_taken = (
+            Song.objects.filter(release_date=self.release_date, slug=self.slug)
+            .exclude(pk=self.pk)
+            .exists()
+        )
+        if is_taken:
+            self.slug = self.get_slug_with_suffix()
+
+    def get_slug_with_suffix(self) -> str:
+        """같은 발매일에 같은 slug의 곡이 있을 때 사용할, 곡 id를 붙인 slug를 반환합니다."""
+
+        suffix = f"-{self.id}"
+        slug_max_length = self._meta.get_field("slug").max_length
+        return self.slug[: slug_max_length - len(suffix)] + suffix
+
     def get_absolute_url(self) -> str:
         return reverse(
             "hottrack:song_detail",  # song_date_detail에서 변경
@@ -101,6 +305,59 @@ class Song(models.Model):
         search_query = quote(f"{self.name}, {self.artist.name}")
         return f"https://www.youtube.com/results?search_query={search_query}"
 
+    @classmethod
+    def sync_like_count_dict(
+        cls, like_count_dict: Dict[int, int], max_workers: int = 4
+    ) -> List[Song]:
+        """{곡 id: 현재 좋아요 수} 사전을 멜론 좋아요 수와 비교하여, 변경된 곡만 갱신합니다.
+
+        조회에 실패한 곡은 갱신하지 않으며, 갱신한 곡 목록을 반환합니다.
+        """
+
+        likes_dict = get_likes_dict_concurrently(
+            like_count_dict.keys(), max_workers=max_workers
+        )
+
+        changed_song_list = cls._get_like_changed_songs(like_count_dict, likes_dict)
+        if changed_song_list:
+            cls.objects.bulk_update(
+                changed_song_list, fields=["like_count"], batch_size=1000
+            )
+            # 목록/상세 페이지의 Last-Modified 기준 시각을 갱신합니다.
+            touch_song_data_updated_at()
+
+        return changed_song_list
+
+    @classmethod
+    async def async_like_count_dict(
+        cls, like_count_dict: Dict[int, int], max_concurrency: int = 4
+    ) -> List[Song]:
+        """sync_like_count_dict의 비동기 버전. 좋아요 수 조회와 갱신 중에 스레드를 점유하지 않습니다."""
+
+        likes_dict = await aget_likes_dict_concurrently(
+            like_count_dict.keys(), max_concurrency=max_concurrency
+        )
+
+        changed_song_list = cls._get_like_changed_songs(like_count_dict, likes_dict)
+        if changed_song_list:
+            await cls.objects.abulk_update(
+                changed_song_list, fields=["like_count"], batch_size=1000
+            )
+            await sync_to_async(touch_song_data_updated_at)()
+
+        return changed_song_list
+
+    @classmethod
+    def _get_like_changed_songs(
+        cls, like_count_dict: Dict[int, int], likes_dict: Dict[int, int]
+    ) -> List[Song]:
+        # 조회에 실패한 곡(likes_dict에 없는 곡)은 제외합니다.
+        return [
+            cls(id=song_id, like_count=likes_dict[song_id])
+            for song_id, like_count in like_count_dict.items()
+            if song_id in likes_dict and likes_dict[song_id] != like_count
+        ]
+
     @classmethod
     def from_dict(cls, data: Dict) -> Song:
         instance = cls(
@@ -116,6 +373,106 @@ class Song(models.Model):
         return instance
 
 
+class ReleaseDateCount(models.Model):
+    """발매일별 곡 수 (아카이브 뷰의 날짜 목록과 이전/다음 기간 조회에 사용)
+
+    Song 테이블 전체를 DISTINCT/날짜 절삭하지 않고, 발매일 수 만큼의 작은 테이블에서 조회합니다.
+    연/월/주 단위 목록은 일별 곡 수에서 .dates() 로 구하므로, 일별 곡 수만 저장합니다.
+
+    Song.save()/delete(), SongQuerySet.delete() 와 load_melon_songs 명령에서 refresh() 로 갱신합니다.
+    그 외 경로(QuerySet.update() 로 발매일 변경, 가수/앨범 삭제에 따른 연쇄 삭제 등)로 곡을 변경했다면
+    rebuild_release_date_counts 명령으로 전체를 다시 집계해주세요.
+    """
+
+    release_date = models.DateField(primary_key=True, verbose_name="발매일")
+    song_count = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.release_date} ({self.song_count})"
+
+    @classmethod
+    def refresh(cls, release_date_list: Iterable[Optional[date]]) -> None:
+        """지정 발매일들의 곡 수를 Song 테이블로부터 다시 집계합니다. (None은 무시)"""
+
+        release_date_set = set(release_date_list) - {None}
+        if not release_date_set:
+            return
+
+        song_count_dict: Dict[date, int] = dict(
+            Song.objects.filter(release_date__in=release_date_set)
+            .values("release_date")
+            .annotate(song_count=models.Count("id"))
+            .values_list("release_date", "song_count")
+        )
+
+        cls.objects.bulk_create(
+            [
+                cls(release_date=release_date, song_count=song_count)
+                for release_date, song_count in song_count_dict.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["release_date"],
+            update_fields=["song_count"],
+        )
+
+        # 곡이 없어진 발매일은 삭제합니다.
+        empty_release_date_set = release_date_set - song_count_dict.keys()
+        if empty_release_date_set:
+            cls.objects.filter(release_date__in=empty_release_date_set).delete()
+
+        invalidate_release_year_list()
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """Song 테이블 전체로부터 발매일별 곡 수를 다시 집계하고, 발매일 수를 반환합니다."""
+
+        song_count_qs = (
+            Song.objects.order_by()
+            .values("release_date")
+            .annotate(song_count=models.Count("id"))
+            .values_list("release_date", "song_count")
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            release_date_count_list = cls.objects.bulk_create(
+                [
+                    cls(release_date=release_date, song_count=song_count)
+                    for release_date, song_count in song_count_qs
+                ],
+                batch_size=1000,
+            )
+
+        invalidate_release_year_list()
+        return len(release_date_count_list)
+
+
+class ChartEntry(models.Model):
+    """차트 일자별 곡의 순위/좋아요 수 기록 (Song.rank는 마지막 차트의 순위만 저장)"""
+
+    # (song, chart_date) 유일 제약의 인덱스가 song 조회에도 쓰이므로, 별도 인덱스는 만들지 않습니다.
+    song = models.ForeignKey(Song, on_delete=models.CASCADE, db_index=False)
+    chart_date = models.DateField(verbose_name="차트 일자")
+    rank = models.PositiveSmallIntegerField()
+    like_count = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["song", "chart_date"],
+                name="hottrack_chartentry_song_date_unique",
+            )
+        ]
+        indexes = [
+            # 특정 일자의 차트를 순위순으로 조회
+            models.Index(
+                fields=["chart_date", "rank"], name="hottrack_chartentry_date_rank"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.chart_date} #{self.rank} {self.song_id}"
+
+
 class Comment(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -1,3 +1,579 @@
-from django.test import TestCase
+import asyncio
+import base64
+import datetime
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from core.testing import assert_max_queries, assert_view_max_queries
+from hottrack.models import Album, Artist, ChartEntry, Genre, ReleaseDateCount, Song
+from hottrack.utils.cover import COVER_CACHE_DIR, aget_cached_cover, get_cached_cover
+from hottrack.utils.jsonstream import iter_json_array
+from hottrack.utils.melon import get_likes_dict_concurrently, iter_melon_uid_chunks
+
+
+def create_song(pk: int, name: str = "", **kwargs) -> Song:
+    """테스트용 곡 생성 (가수/앨범은 곡 id로 함께 생성)"""
+
+    artist, __ = Artist.objects.get_or_create(
+        pk=kwargs.pop("artist_id", pk), defaults={"name": f"가수{pk}"}
+    )
+    album, __ = Album.objects.get_or_create(
+        pk=kwargs.pop("album_id", pk), defaults={"name": f"앨범{pk}"}
+    )
+    kwargs.setdefault("rank", pk)
+    kwargs.setdefault("release_date", datetime.date(2024, 1, 1))
+    kwargs.setdefault("like_count", 0)
+    song = Song(
+        pk=pk,
+        name=name or f"노래{pk}",
+        artist=artist,
+        album=album,
+        cover_url=f"http://localhost/{pk}.png",
+        lyrics="",
+        **kwargs,
+    )
+    song.save()
+    return song
+
+
+class SongSearchVectorTest(TestCase):
+    def test_save_computes_search_vector_in_same_query(self):
+        artist = Artist.objects.create(pk=1, name="아이유")
+        album = Album.objects.create(pk=1, name="꽃갈피")
+        song = Song(
+            pk=1,
+            name="Love wins all",
+            artist=artist,
+            album=album,
+            rank=1,
+            cover_url="http://localhost/1.png",
+            lyrics="",
+            release_date=datetime.date(2024, 1, 24),
+            like_count=0,
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            song.save()
+
+        # 기본키를 지정한 저장의 UPDATE 시도와 INSERT 외에, search_vector 갱신 쿼리가 없어야 합니다.
+        song_write_sql_list = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(
+                ('UPDATE "hottrack_song"', 'INSERT INTO "hottrack_song"')
+            )
+        ]
+        self.assertEqual(len(song_write_sql_list), 2)
+
+        self.assertEqual(Song.objects.search("love").get(), song)
+        self.assertEqual(Song.objects.search("아이유").get(), song)
+        self.assertEqual(Song.objects.search("꽃갈피").get(), song)
+
+    def test_save_with_update_fields_refreshes_search_vector(self):
+        song = create_song(1, name="Love wins all")
+        other_artist = Artist.objects.create(pk=2, name="IU")
+
+        song.name = "Shopper"
+        song.save(update_fields=["name"])
+        self.assertEqual(Song.objects.search("shopper").get(), song)
+        self.assertFalse(Song.objects.search("love").exists())
+
+        song.artist = other_artist
+        song.save(update_fields=["artist"])
+        self.assertEqual(Song.objects.search("iu").get(), song)
+
+        # 검색 벡터와 무관한 필드만 저장할 때에는 search_vector를 갱신하지 않습니다.
+        with CaptureQueriesContext(connection) as context:
+            song.like_count = 10
+            song.save(update_fields=["like_count"])
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("search_vector", context.captured_queries[0]["sql"])
+
+    def test_artist_and_album_rename_refresh_search_vector(self):
+        song = create_song(1, name="Love wins all")
+
+        song.artist.name = "IU"
+        song.artist.save()
+        song.album.name = "Pieces"
+        song.album.save(update_fields=["name"])
+
+        self.assertEqual(Song.objects.search("iu").get(), song)
+        self.assertEqual(Song.objects.search("pieces").get(), song)
+        self.assertFalse(Song.objects.search("가수1").exists())
+
+
+class SongSlugTest(TestCase):
+    def test_same_name_on_same_date_gets_unique_slug(self):
+        song1 = create_song(1, name="Love wins all")
+        song2 = create_song(2, name="Love wins all")
+        # 다른 발매일이라면 같은 slug를 사용합니다.
+        song3 = create_song(
+            3, name="Love wins all", release_date=datetime.date(2024, 2, 1)
+        )
+
+        self.assertEqual(song1.slug, "love-wins-all")
+        self.assertEqual(song2.slug, "love-wins-all-2")
+        self.assertEqual(song3.slug, "love-wins-all")
+
+        # 다시 저장해도 자신의 slug는 바뀌지 않습니다.
+        song1.save()
+        self.assertEqual(song1.slug, "love-wins-all")
+
+        # 발매일을 옮겨 slug가 겹치게 되어도 IntegrityError 없이 저장합니다.
+        song3.release_date = song1.release_date
+        song3.save()
+        self.assertEqual(song3.slug, "love-wins-all-3")
+
+        for song in (song1, song2, song3):
+            with self.subTest(slug=song.slug):
+                response = self.client.get(song.get_absolute_url())
+                self.assertEqual(response.context["song"], song)
+
+
+class ReleaseDateCountTest(TestCase):
+    def get_count_dict(self):
+        return dict(ReleaseDateCount.objects.values_list("release_date", "song_count"))
+
+    def test_save_and_delete_refresh_counts(self):
+        day1 = datetime.date(2024, 1, 1)
+        day2 = datetime.date(2024, 2, 1)
+
+        song1 = create_song(1, release_date=day1)
+        create_song(2, release_date=day1)
+        self.assertEqual(self.get_count_dict(), {day1: 2})
+
+        # 조회한 곡의 발매일을 바꾸면, 이전/현재 발매일 모두 다시 집계합니다.
+        song1 = Song.objects.get(pk=song1.pk)
+        song1.release_date = day2
+        song1.save()
+        self.assertEqual(self.get_count_dict(), {day1: 1, day2: 1})
+
+        song1.delete()
+        self.assertEqual(self.get_count_dict(), {day1: 1})
+
+        Song.objects.all().delete()
+        self.assertEqual(self.get_count_dict(), {})
+
+    def test_rebuild(self):
+        day1 = datetime.date(2024, 1, 1)
+        create_song(1, release_date=day1)
+        create_song(2, release_date=day1)
+        Song.objects.filter(pk=2).update(release_date=datetime.date(2024, 3, 1))
+
+        self.assertEqual(ReleaseDateCount.rebuild(), 2)
+        self.assertEqual(self.get_count_dict(), {day1: 1, datetime.date(2024, 3, 1): 1})
+
+
+class SongViewQueryCountTest(TestCase):
+    """목록/아카이브/내보내기/API 뷰의 쿼리 수가 곡 수에 비례하지 않는지 (N+1 쿼리) 확인합니다."""
+
+    song_count = 12
+
+    @classmethod
+    def setUpTestData(cls):
+        genre_list = [Genre.objects.create(name=f"장르{i}") for i in range(3)]
+        for pk in range(1, cls.song_count + 1):
+            song = create_song(
+                pk,
+                # 가수/앨범을 여러 곡이 공유하도록 합니다.
+                artist_id=pk % 4 + 1,
+                album_id=pk % 3 + 1,
+                release_date=datetime.date(2024, 1 + pk % 3, 1 + pk % 5),
+            )
+            song.genre_set.set(genre_list[: pk % 3 + 1])
+            ChartEntry.objects.create(
+                song=song,
+                chart_date=datetime.date(2024, 6, 1),
+                rank=pk,
+                like_count=pk * 10,
+            )
+
+    def setUp(self):
+        # 템플릿 조각 캐시에 가려지는 쿼리가 없도록, 매번 캐시를 비웁니다.
+        cache.clear()
+
+    def test_archive_views(self):
+        path_list = [
+            (reverse("hottrack:song_archive_index"), 3),
+            (reverse("hottrack:song_archive_year", args=[2024]), 4),
+            (reverse("hottrack:song_archive_month", args=[2024, 2]), 4),
+            (reverse("hottrack:song_archive_day", args=[2024, 2, 2]), 5),
+            (reverse("hottrack:song_archive_week", args=[2024, 5]), 4),
+        ]
+        for path, max_count in path_list:
+            with self.subTest(path=path):
+                response = assert_view_max_queries(self.client, path, max_count)
+                self.assertTrue(response.context["object_list"])
+
+    def test_index(self):
+        response = assert_view_max_queries(self.client, reverse("hottrack:index"), 2)
+        self.assertEqual(len(response.context["object_list"]), 10)
+
+    def test_export_views(self):
+        for format in ("csv", "xlsx"):
+            with self.subTest(format=format):
+                # 스트리밍 응답은 본문을 읽을 때 쿼리가 실행되므로, 본문을 모두 읽을 때까지 셉니다.
+                with assert_max_queries(1):
+                    response = self.client.get(
+                        reverse("hottrack:export", args=[format])
+                    )
+                    content = b"".join(response.streaming_content)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(content)
+
+    def test_chart_api(self):
+        response = assert_view_max_queries(
+            self.client, reverse("hottrack:api_song_list") + "?page_size=100", 1
+        )
+        self.assertEqual(len(response.json()["results"]), self.song_count)
+
+        response = assert_view_max_queries(
+            self.client, reverse("hottrack:song_rank_history", args=[1]), 2
+        )
+        self.assertEqual(len(response.json()["rank_list"]), 1)
+
+
+class SongCardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.song = create_song(1, "변경 전 곡")
+
+    def assertCardRendered(self, text: str):
+        self.assertContains(self.client.get(reverse("hottrack:index")), text)
+
+    def test_song_save_invalidates_card(self):
+        self.assertCardRendered("변경 전 곡")
+        self.song.name = "변경 후 곡"
+        self.song.save()
+        self.assertCardRendered("변경 후 곡")
+
+    def test_artist_rename_invalidates_card(self):
+        self.assertCardRendered("가수1")
+        artist = self.song.artist
+        artist.name = "바뀐 가수"
+        artist.save(update_fields=["name"])
+        self.assertCardRendered("바뀐 가수")
+
+
+class SongApiCursorTest(TestCase):
+    """잘못되거나 변조된 커서에는 500 오류가 아닌 400 응답을 합니다."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for pk in range(1, 4):
+            create_song(pk)
+
+    def make_cursor(self, position) -> str:
+        data = json.dumps({"p": position}).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    def assertBadCursor(self, path: str, cursor: str, **params):
+        response = self.client.get(path, {"cursor": cursor, **params})
+        self.assertEqual(response.status_code, 400)
+
+    def test_valid_cursor(self):
+        path = reverse("hottrack:api_song_list")
+        response = self.client.get(path, {"page_size": 2})
+        next_url = response.json()["next"]
+
+        response = self.client.get(next_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()["results"]], [3])
+
+    def test_invalid_cursor(self):
+        path = reverse("hottrack:api_song_list")
+        for cursor in [
+            "not-a-cursor!!",
+            base64.urlsafe_b64encode(b"not json").decode(),
+            self.make_cursor([1]),  # 정렬 필드 수가 다름
+            self.make_cursor(["abc", 1]),  # 정수가 아닌 순위
+            self.make_cursor([None, 1]),
+        ]:
+            with self.subTest(cursor=cursor):
+                self.assertBadCursor(path, cursor)
+
+    def test_invalid_cursor_on_archive_and_search(self):
+        response = self.client.get(
+            reverse("hottrack:api_song_search"), {"query": "노래", "page_size": 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(response.json()["next"]).status_code, 200)
+
+        self.assertBadCursor(
+            reverse("hottrack:api_song_archive_year", args=[2024]),
+            self.make_cursor(["2024-13-45", 1]),
+        )
+        self.assertBadCursor(
+            reverse("hottrack:api_song_search"),
+            self.make_cursor(["high", 1, 1]),
+            query="노래",
+        )
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_song(1)
+        # 마이그레이션에서 id=1 사용자를 생성하므로, 겹치지 않는 id를 지정합니다.
+        cls.user = get_user_model().objects.create_user(pk=1000, username="user")
+
+    def test_anonymous_revalidation(self):
+        response = self.client.get(reverse("hottrack:index"))
+        etag = response["ETag"]
+        self.assertIn("public", response["Cache-Control"])
+
+        response = self.client.get(reverse("hottrack:index"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def assertChangeInvalidatesEtag(self, change):
+        path = reverse("hottrack:index")
+        etag = self.client.get(path)["ETag"]
+        # 변경이 같은 초에 일어나도 ETag가 바뀌어야 합니다.
+        change()
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_song_save_invalidates_etag(self):
+        song = Song.objects.get(pk=1)
+        song.name = "변경된 곡"
+        self.assertChangeInvalidatesEtag(song.save)
+
+    def test_song_delete_invalidates_etag(self):
+        self.assertChangeInvalidatesEtag(Song.objects.get(pk=1).delete)
+
+    def test_song_queryset_delete_invalidates_etag(self):
+        self.assertChangeInvalidatesEtag(Song.objects.filter(pk=1).delete)
+
+    def test_authenticated_user_never_gets_anonymous_page_304(self):
+        anonymous_response = self.client.get(reverse("hottrack:index"))
+
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("hottrack:index"),
+            HTTP_IF_NONE_MATCH=anonymous_response["ETag"],
+            HTTP_IF_MODIFIED_SINCE=anonymous_response["Last-Modified"],
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        # 로그인 사용자의 페이지(로그아웃 폼)가 렌더링되었는지 확인합니다.
+        self.assertContains(response, "csrfmiddlewaretoken")
+
+    def test_authenticated_user_api_revalidation(self):
+        path = reverse("hottrack:api_song_detail", args=[1])
+        self.client.force_login(self.user)
+
+        response = self.client.get(path)
+        self.assertIn("private", response["Cache-Control"])
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+
+class CachedCoverConcurrencyTest(SimpleTestCase):
+    """같은 커버를 동시에 렌더링해도, 오류나 이름이 바뀐 사본 없이 파일 하나만 남습니다."""
+
+    concurrency = 8
+    cover_count = 30
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), "red").save(buffer, format="png")
+        self.cover_bytes = buffer.getvalue()
+
+    def slow_fetch_bytes(self, url):
+        # 여러 요청이 모두 캐시 미스로 판단한 뒤에 저장하도록, 다운로드를 지연합니다.
+        time.sleep(0.01)
+        return self.cover_bytes
+
+    async def aslow_fetch_bytes(self, url):
+        await asyncio.sleep(0.01)
+        return self.cover_bytes
+
+    def assertSingleCoverFile(self, song_id: int, cached_cover_list):
+        self.assertTrue(all(cached_cover_list))
+        __, file_names = default_storage.listdir(f"{COVER_CACHE_DIR}/{song_id}")
+        self.assertEqual(
+            [f"{COVER_CACHE_DIR}/{song_id}/{file_name}" for file_name in file_names],
+            [cached_cover_list[0].name],
+        )
+
+    def test_concurrent_get_cached_cover(self):
+        def get(song_id):
+            return get_cached_cover(song_id, f"http://localhost/{song_id}.png", "가수")
+
+        with mock.patch(
+            "hottrack.utils.cover.fetch_bytes", side_effect=self.slow_fetch_bytes
+        ), ThreadPoolExecutor(self.concurrency) as executor:
+            for song_id in range(1, self.cover_count + 1):
+                cached_cover_list = list(
+                    executor.map(get, [song_id] * self.concurrency)
+                )
+                self.assertSingleCoverFile(song_id, cached_cover_list)
+
+    def test_concurrent_aget_cached_cover(self):
+        async def run(song_id):
+            return await asyncio.gather(
+                *[
+                    aget_cached_cover(
+                        song_id, f"http://localhost/{song_id}.png", "가수"
+                    )
+                    for __ in range(self.concurrency)
+                ]
+            )
+
+        with mock.patch(
+            "hottrack.utils.cover.afetch_bytes", side_effect=self.aslow_fetch_bytes
+        ):
+            for song_id in range(1, self.cover_count + 1):
+                cached_cover_list = asyncio.run(run(song_id))
+                self.assertSingleCoverFile(song_id, cached_cover_list)
+
+    def test_old_cover_is_evicted(self):
+        with mock.patch(
+            "hottrack.utils.cover.fetch_bytes", return_value=self.cover_bytes
+        ):
+            get_cached_cover(100, "http://localhost/old.png", "가수")
+            cached_cover = get_cached_cover(100, "http://localhost/new.png", "가수")
+        self.assertSingleCoverFile(100, [cached_cover])
+
+    def test_vanished_cover_is_cache_miss(self):
+        real_get_modified_time = default_storage.get_modified_time
+        call_count = 0
+
+        def get_modified_time(name):
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                # 저장 직후에 다른 요청이 파일을 삭제한 상황
+                default_storage.delete(name)
+            return real_get_modified_time(name)
+
+        with mock.patch(
+            "hottrack.utils.cover.fetch_bytes", return_value=self.cover_bytes
+        ), mock.patch.object(
+            default_storage, "get_modified_time", side_effect=get_modified_time
+        ):
+            cached_cover = get_cached_cover(101, "http://localhost/101.png", "가수")
+
+        self.assertEqual(call_count, 2)
+        self.assertSingleCoverFile(101, [cached_cover])
+
+
+class DroppingLikesHandler(BaseHTTPRequestHandler):
+    """첫 청크는 응답 없이 연결을 끊고, 둘째 청크는 본문 도중에 연결을 끊는 멜론 대역"""
+
+    def do_GET(self):
+        query = self.path.partition("?")[2]
+        melon_uid_list = [
+            int(s) for s in query.partition("=")[2].split("%2C") if s.isdigit()
+        ]
+        first_uid = melon_uid_list[0]
+
+        if first_uid == self.server.dropped_uid:
+            # 상태 줄도 보내지 않고 끊으면 RemoteDisconnected
+            self.close_connection = True
+            return
+
+        body = json.dumps(
+            {
+                "contsLike": [
+                    {"CONTSID": uid, "SUMMCNT": uid % 1000} for uid in melon_uid_list
+                ]
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if first_uid == self.server.truncated_uid:
+            # Content-Length보다 짧게 보내고 끊으면 IncompleteRead
+            self.wfile.write(body[: len(body) // 2])
+        else:
+            self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LikesDictConcurrentlyTest(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), DroppingLikesHandler)
+        self.server.dropped_uid = None
+        self.server.truncated_uid = None
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        url = "http://127.0.0.1:%d/getSongLike.json" % self.server.server_port
+        patcher = mock.patch("hottrack.utils.melon.LIKES_URL", url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dropped_chunks_are_skipped(self):
+        melon_uid_list = list(range(10_000_000, 10_000_600))
+        chunk_list = list(iter_melon_uid_chunks(melon_uid_list))
+        self.assertGreaterEqual(len(chunk_list), 3)
+        dropped_chunk, truncated_chunk, *ok_chunk_list = chunk_list
+        self.server.dropped_uid = dropped_chunk[0]
+        self.server.truncated_uid = truncated_chunk[0]
+
+        likes_dict = get_likes_dict_concurrently(melon_uid_list, timeout=5)
+
+        expected = {uid: uid % 1000 for chunk in ok_chunk_list for uid in chunk}
+        self.assertEqual(likes_dict, expected)
+
+
+class IterJsonArrayTest(SimpleTestCase):
+    def assertParsedInAnyChunkSize(self, text: str):
+        expected = json.loads(text)
+        for chunk_size in range(1, len(text) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                fp = io.StringIO(text)
+                self.assertEqual(
+                    list(iter_json_array(fp, chunk_size=chunk_size)), expected
+                )
+
+    def test_scalar_split_across_chunks(self):
+        # 청크 경계에서 잘린 "0" 을 0.1 대신 원소로 반환하지 않아야 합니다.
+        self.assertParsedInAnyChunkSize("[[], 0.1]")
+        self.assertParsedInAnyChunkSize("[1e5, -2.5e-3, true, null, false, 123456]")
+
+    def test_containers_and_strings(self):
+        self.assertParsedInAnyChunkSize('[{"곡명": "a, b]", "순위": [1, 2.25]}, "]"]')
+        self.assertParsedInAnyChunkSize("[ ]")
+
+    def test_invalid_separator(self):
+        for chunk_size in (1, 3, 100):
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(io.StringIO("[1 2]"), chunk_size=chunk_size))
@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, re_path
 from . import converters  # noqa
-from . import views
+from . import api, views
 
 app_name = "hottrack"
 
@@ -11,7 +12,17 @@ urlpatterns = [
     re_path(
         route=r"^export\.(?P<format>(csv|xlsx))$", view=views.export, name="export"
     ),
-    path(route="<int:pk>/cover.png", view=views.cover_png, name="cover_png"),
+    path(
+        route="<int:pk>/cover.png",
+        # ASGI 서버로 실행할 때에는 비동기 뷰를 사용합니다.
+        view=views.acover_png if settings.HOTTRACK_ASYNC_VIEWS else views.cover_png,
+        name="cover_png",
+    ),
+    path(
+        route="<int:pk>/ranks.json",
+        view=views.song_rank_history,
+        name="song_rank_history",
+    ),
     path(
         route="archives/<int:year>/",
         view=views.SongYearArchiveView.as_view(),
@@ -47,4 +58,30 @@ urlpatterns = [
         view=views.SongDateDetailView.as_view(),
         name="song_detail",  # 앞서 위치한 song_detail과 같은 이름이지만, 인자 구성이 다릅니다.
     ),
+    path(route="api/songs/", view=api.song_list_api, name="api_song_list"),
+    path(
+        route="api/songs/search/",
+        view=api.song_search_api,
+        name="api_song_search",
+    ),
+    path(
+        route="api/songs/<int:pk>/",
+        view=api.song_detail_api,
+        name="api_song_detail",
+    ),
+    path(
+        route="api/songs/archives/<int:year>/",
+        view=api.song_archive_api,
+        name="api_song_archive_year",
+    ),
+    path(
+        route="api/songs/archives/<int:year>/<int:month>/",
+        view=api.song_archive_api,
+        name="api_song_archive_month",
+    ),
+    path(
+        route="api/songs/archives/<int:year>/<int:month>/<int:day>/",
+        view=api.song_archive_api,
+        name="api_song_archive_day",
+    ),
 ]
@@ -1,7 +1,18 @@
+import hashlib
+import posixpath
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from io import BytesIO
+from typing import List, Optional, Sequence, Tuple
 
-import requests
-from PIL import Image, ImageDraw, ImageFont, __version__ as pil_version
+from asgiref.sync import sync_to_async
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, default_storage
+from django.utils import timezone
+from PIL import Image, ImageDraw, ImageFont, UnidentifiedImageError
+from PIL import __version__ as pil_version
+
+from .http import afetch_bytes, fetch_bytes
 
 
 # PIL 버전 10부터 변경되는 동작이 있어서, 버전을 체크해줍니다.
@@ -9,13 +20,26 @@ PIL_VERSION = tuple(map(int, pil_version.split(".")))
 
 
 def make_cover_image(cover_url: str, text: str, canvas_size: int = 256) -> Image:
+    # 공유 세션(커넥션 풀, 타임아웃, 크기 제한, LRU 캐시)을 통해 커버 이미지를 받습니다.
+    cover_bytes = fetch_bytes(cover_url)
+    return render_cover_image(cover_bytes, text, canvas_size=canvas_size)
+
+
+def render_cover_image(
+    cover_bytes: Optional[bytes], text: str, canvas_size: int = 256
+) -> Image:
     canvas = Image.new("RGB", (canvas_size, canvas_size), "white")
     draw = ImageDraw.Draw(canvas)
 
-    res = requests.get(cover_url)
-    if res.ok:
-        cover_image = Image.open(BytesIO(res.content))
-        cover_image.thumbnail((canvas_size, canvas_size))
+    cover_image = None
+    if cover_bytes is not None:
+        try:
+            cover_image = Image.open(BytesIO(cover_bytes))
+            cover_image.thumbnail((canvas_size, canvas_size))
+        except (UnidentifiedImageError, OSError):
+            cover_image = None
+
+    if cover_image is not None:
         canvas.paste(cover_image, (0, 0))
     else:
         # 이미지 다운로드에 실패했을 경우, X 표시를 그립니다.
@@ -53,3 +77,219 @@ def make_cover_image(cover_url: str, text: str, canvas_size: int = 256) -> Image
     draw.text(xy=(x, y), text=text, fill="black", font=font)
 
     return canvas
+
+
+# 렌더링된 커버 이미지를 저장할 스토리지 내 경로
+COVER_CACHE_DIR = "hottrack/covers"
+
+# 렌더링한 커버 이미지가 확인 직후에 삭제되었을 때, 다시 렌더링하는 최대 횟수
+COVER_SAVE_MAX_TRIES = 2
+
+# render_song_covers 명령으로 미리 렌더링해두는 커버 크기 목록
+COVER_SIZES = (64, 128, 256, 512)
+
+
+def snap_cover_size(canvas_size: int) -> int:
+    """요청 크기와 가장 가까운, 미리 렌더링된 커버 크기를 반환합니다."""
+    return min(COVER_SIZES, key=lambda size: (abs(size - canvas_size), -size))
+
+
+@dataclass
+class CachedCover:
+    name: str  # 스토리지 내 파일 경로
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def get_cover_etag(song_id: int, canvas_size: int, cover_url: str, text: str) -> str:
+    """커버 이미지를 렌더링하지 않고도 계산할 수 있는 캐시 키 (ETag로도 사용)"""
+
+    # 커버 주소나 텍스트가 바뀌면 해시가 바뀌므로, 예전 캐시는 자연스럽게 무효화됩니다.
+    source_hash = hashlib.sha1(f"{cover_url}\n{text}".encode("utf-8")).hexdigest()
+    return f"{song_id}-{canvas_size}-{source_hash[:16]}"
+
+
+def get_cover_cache_name(song_id: int, etag: str) -> str:
+    return f"{COVER_CACHE_DIR}/{song_id}/{etag}.png"
+
+
+def get_cached_cover(
+    song_id: int,
+    cover_url: str,
+    text: str,
+    canvas_size: int = 256,
+    storage: Storage = default_storage,
+) -> Optional[CachedCover]:
+    """스토리지에 렌더링된 커버 이미지가 없을 때에만 렌더링하여 저장합니다.
+
+    커버 이미지 다운로드에 실패하면 실패 이미지를 캐싱하지 않도록 None을 반환합니다.
+    """
+
+    etag = get_cover_etag(song_id, canvas_size, cover_url, text)
+    name = get_cover_cache_name(song_id, etag)
+
+    cover_bytes = None
+    # 확인 직후에 다른 요청이 파일을 삭제했다면, 캐시 미스로 보고 한 번 더 렌더링합니다.
+    for __ in range(COVER_SAVE_MAX_TRIES):
+        if not storage.exists(name):
+            cover_bytes = cover_bytes or fetch_bytes(cover_url)
+            if cover_bytes is None:
+                return None
+            _save_cover_image(song_id, name, cover_bytes, text, canvas_size, storage)
+
+        try:
+            last_modified = storage.get_modified_time(name)
+        except FileNotFoundError:
+            continue
+        return CachedCover(name=name, etag=etag, last_modified=last_modified)
+
+    return None
+
+
+async def aget_cached_cover(
+    song_id: int,
+    cover_url: str,
+    text: str,
+    canvas_size: int = 256,
+    storage: Storage = default_storage,
+) -> Optional[CachedCover]:
+    """get_cached_cover의 비동기 버전. 커버 이미지 다운로드 중에 스레드를 점유하지 않습니다.
+
+    스토리지와 Pillow는 동기 API이므로 스레드 풀에서 실행합니다.
+    (thread_sensitive=False : 여러 요청의 렌더링을 동시에 실행)
+    """
+
+    etag = get_cover_etag(song_id, canvas_size, cover_url, text)
+    name = get_cover_cache_name(song_id, etag)
+
+    cover_bytes = None
+    for __ in range(COVER_SAVE_MAX_TRIES):
+        if not await sync_to_async(storage.exists, thread_sensitive=False)(name):
+            cover_bytes = cover_bytes or await afetch_bytes(cover_url)
+            if cover_bytes is None:
+                return None
+            await sync_to_async(_save_cover_image, thread_sensitive=False)(
+                song_id, name, cover_bytes, text, canvas_size, storage
+            )
+
+        try:
+            last_modified = await sync_to_async(
+                storage.get_modified_time, thread_sensitive=False
+            )(name)
+        except FileNotFoundError:
+            continue
+        return CachedCover(name=name, etag=etag, last_modified=last_modified)
+
+    return None
+
+
+def _save_cover_image(
+    song_id: int,
+    name: str,
+    cover_bytes: bytes,
+    text: str,
+    canvas_size: int,
+    storage: Storage,
+) -> None:
+    """커버 이미지를 렌더링하여 name 경로에 저장합니다.
+
+    같은 커버를 동시에 렌더링한 요청이 있더라도, 이름이 바뀐 사본 없이 name 경로의 파일 하나만 남깁니다.
+    """
+
+    cover_image = render_cover_image(cover_bytes, text, canvas_size=canvas_size)
+    buffer = BytesIO()
+    cover_image.save(buffer, format="png")
+
+    # 같은 곡/크기의 예전 커버 주소로 렌더링된 이미지를 삭제합니다.
+    # (다른 요청이 저장 중이거나 방금 저장한 현재 ETag의 이미지는 삭제하지 않습니다.)
+    etag = posixpath.splitext(posixpath.basename(name))[0]
+    evict_cached_covers(
+        song_id, canvas_size=canvas_size, keep_etag=etag, storage=storage
+    )
+
+    saved_name = storage.save(name, ContentFile(buffer.getvalue()))
+    if saved_name != name:
+        # 다른 요청이 먼저 같은 이름으로 저장했다면, 스토리지가 이름을 바꿔 저장한 사본은 지웁니다.
+        # (같은 ETag의 사본은 evict_cached_covers 에서 삭제하지 않으므로, 저장한 요청이 직접 지웁니다.)
+        storage.delete(saved_name)
+
+
+def evict_cached_covers(
+    song_id: Optional[int] = None,
+    canvas_size: Optional[int] = None,
+    max_age: Optional[timedelta] = None,
+    keep_etag: Optional[str] = None,
+    storage: Storage = default_storage,
+) -> int:
+    """지정 곡(미지정 시 전체 곡)의 렌더링된 커버 이미지를 삭제하고, 삭제한 파일 수를 반환합니다.
+
+    canvas_size를 지정하면 해당 크기만, max_age를 지정하면 그보다 오래된 파일만 삭제하며,
+    keep_etag를 지정하면 해당 ETag의 파일은 삭제하지 않습니다.
+    """
+
+    if song_id is None:
+        try:
+            dir_names, __ = storage.listdir(COVER_CACHE_DIR)
+        except FileNotFoundError:
+            return 0
+        song_id_list = [int(dir_name) for dir_name in dir_names if dir_name.isdigit()]
+    else:
+        song_id_list = [song_id]
+
+    deleted_count = 0
+    for _song_id in song_id_list:
+        dir_path = f"{COVER_CACHE_DIR}/{_song_id}"
+        try:
+            __, file_names = storage.listdir(dir_path)
+        except FileNotFoundError:
+            continue
+
+        for file_name in file_names:
+            if canvas_size is not None and not file_name.startswith(
+                f"{_song_id}-{canvas_size}-"
+            ):
+                continue
+            if keep_etag is not None and file_name.startswith(keep_etag):
+                continue
+            name = f"{dir_path}/{file_name}"
+            try:
+                if max_age is not None:
+                    # USE_TZ 설정에 따라 두 시각 모두 naive 혹은 aware 입니다.
+                    if timezone.now() - storage.get_modified_time(name) < max_age:
+                        continue
+                storage.delete(name)
+            except FileNotFoundError:
+                # 다른 요청이 먼저 삭제한 파일입니다.
+                continue
+            deleted_count += 1
+
+    return deleted_count
+
+
+def render_cached_covers(
+    song_list: List[Tuple[int, str, str]],
+    canvas_sizes: Sequence[int] = COVER_SIZES,
+    force: bool = False,
+) -> Tuple[int, int, int]:
+    """(곡 id, 커버 주소, 텍스트) 목록의 커버 이미지를 크기별로 미리 렌더링합니다.
+
+    프로세스 풀에서 호출할 수 있도록 모델에 의존하지 않으며,
+    (렌더링 수, 이미 있어서 건너뛴 수, 다운로드 실패 수)를 반환합니다.
+    """
+
+    rendered_count = skipped_count = failed_count = 0
+
+    for song_id, cover_url, text in song_list:
+        if force:
+            evict_cached_covers(song_id)
+
+        for canvas_size in canvas_sizes:
+            etag = get_cover_etag(song_id, canvas_size, cover_url, text)
+            if default_storage.exists(get_cover_cache_name(song_id, etag)):
+                skipped_count += 1
+            elif get_cached_cover(song_id, cover_url, text, canvas_size) is None:
+                failed_count += 1
+            else:
+                rendered_count += 1
+
+    return rendered_count, skipped_count, failed_count
@@ -0,0 +1,37 @@
+import csv
+from typing import IO, Iterable, Iterator, Sequence
+
+from openpyxl import Workbook
+
+
+class Echo:
+    """csv.writer가 쓰는 문자열을 버퍼에 모으지 않고 그대로 반환하는 가짜 파일 객체"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv_lines(header: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    """헤더와 행들을 CSV 문자열로 한 줄씩 생성합니다. (메모리 사용량이 행 수와 무관)"""
+
+    writer = csv.writer(Echo())
+
+    # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM을 먼저 출력합니다. (utf-8-sig 인코딩과 동일)
+    yield "\ufeff" + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_xlsx(header: Sequence[str], rows: Iterable[Sequence], fp: IO[bytes]) -> None:
+    """write-only 모드로 엑셀 파일을 씁니다.
+
+    write-only 모드에서는 행을 메모리에 모으지 않고 임시 파일에 바로 기록하므로,
+    행 수와 무관하게 일정한 메모리만 사용합니다.
+    """
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    worksheet.append(list(header))
+    for row in rows:
+        worksheet.append(list(row))
+    workbook.save(fp)
@@ -0,0 +1,269 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .melon import HEADERS
+
+
+# (연결 타임아웃, 읽기 타임아웃) 초
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 10)
+
+# 응답 전체를 받는 데 허용하는 최대 시간 (읽기 타임아웃은 각 read 호출마다 적용되기 때문)
+DEFAULT_DEADLINE = 15
+
+# 이보다 큰 응답은 받지 않고 연결을 끊습니다.
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# 이벤트 루프 하나에서 동시에 보내는 최대 요청 수 (afetch_bytes)
+ASYNC_MAX_CONCURRENCY = 32
+
+
+class LRUBytesCache:
+    """최근에 사용한 bytes 값을 개수/전체 크기 제한 안에서 유지하는 스레드 안전한 LRU 캐시"""
+
+    def __init__(self, max_items: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            old_value = self._data.pop(key, None)
+            if old_value is not None:
+                self._total_bytes -= len(old_value)
+
+            self._data[key] = value
+            self._total_bytes += len(value)
+
+            # 가장 오래 전에 사용한 값부터 제거합니다.
+            while (
+                len(self._data) > self.max_items or self._total_bytes > self.max_bytes
+            ):
+                __, removed_value = self._data.popitem(last=False)
+                self._total_bytes -= len(removed_value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._total_bytes = 0
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# 프로세스 내에서 공유하는 원본 응답 캐시 (같은 커버를 여러 크기로 렌더링할 때 재다운로드 방지)
+fetched_bytes_cache = LRUBytesCache()
+
+
+def get_session() -> requests.Session:
+    """keep-alive 연결을 재사용하는, 프로세스 내 공유 세션을 반환합니다."""
+
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=2,
+                    backoff_factor=0.3,  # 0.3초, 0.6초 간격으로 재시도
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET", "HEAD"),
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=8, pool_maxsize=32, max_retries=retry
+                )
+
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+
+    return _session
+
+
+def fetch_bytes(
+    url: str,
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    deadline: float = DEFAULT_DEADLINE,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    use_cache: bool = True,
+) -> Optional[bytes]:
+    """지정 URL의 응답 본문을 반환합니다. 실패/시간초과/크기초과 시에는 None을 반환합니다."""
+
+    if use_cache:
+        content = fetched_bytes_cache.get(url)
+        if content is not None:
+            return content
+
+    started_at = time.monotonic()
+    try:
+        with get_session().get(url, timeout=timeout, stream=True) as res:
+            if not res.ok:
+                return None
+
+            content_length = res.headers.get("Content-Length", "")
+            if content_length.isdigit() and int(content_length) > max_bytes:
+                return None
+
+            chunk_list = []
+            received_bytes = 0
+            for chunk in res.iter_content(chunk_size=64 * 1024):
+                received_bytes += len(chunk)
+                if received_bytes > max_bytes:
+                    return None
+                if time.monotonic() - started_at > deadline:
+                    return None
+                chunk_list.append(chunk)
+    except requests.RequestException:
+        return None
+
+    content = b"".join(chunk_list)
+    if use_cache:
+        fetched_bytes_cache.set(url, content)
+    return content
+
+
+class _AsyncState:
+    """이벤트 루프 별로 공유하는 비동기 HTTP 클라이언트, 동시 요청 제한, 진행 중인 요청"""
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONCURRENCY,
+                max_keepalive_connections=ASYNC_MAX_CONCURRENCY,
+            ),
+            # 연결 실패 시에만 재시도합니다. (응답 상태 코드에 따른 재시도는 하지 않음)
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+        self.semaphore = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+        # 같은 주소를 동시에 여러 번 요청하면, 먼저 보낸 요청의 결과를 함께 사용합니다.
+        self.pending_dict: Dict[str, asyncio.Future] = {}
+
+
+_async_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_state() -> _AsyncState:
+    loop = asyncio.get_running_loop()
+    state = _async_states.get(loop)
+    if state is None:
+        state = _async_states[loop] = _AsyncState()
+    return state
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 keep-alive 연결을 재사용하는, 공유 비동기 클라이언트를 반환합니다.
+
+    ASGI 서버처럼 하나의 이벤트 루프가 계속 실행되는 환경에서 연결이 재사용됩니다.
+    """
+
+    return _get_async_state().client
+
+
+async def afetch_bytes(
+    url: str,
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    deadline: float = DEFAULT_DEADLINE,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    use_cache: bool = True,
+) -> Optional[bytes]:
+    """fetch_bytes의 비동기 버전. 스레드를 점유하지 않고 응답을 기다립니다.
+
+    이벤트 루프 별로 동시 요청 수를 ASYNC_MAX_CONCURRENCY로 제한하고,
+    같은 주소에 대한 동시 요청은 한 번만 보냅니다.
+    """
+
+    if use_cache:
+        content = fetched_bytes_cache.get(url)
+        if content is not None:
+            return content
+
+    state = _get_async_state()
+    pending = state.pending_dict.get(url)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # 먼저 보낸 요청이 취소되었다면 실패로 처리합니다.
+            if pending.cancelled():
+                return None
+            raise
+
+    future = asyncio.get_running_loop().create_future()
+    state.pending_dict[url] = future
+    try:
+        async with state.semaphore:
+            try:
+                content = await asyncio.wait_for(
+                    _afetch_bytes(state.client, url, timeout, max_bytes), deadline
+                )
+            except asyncio.TimeoutError:
+                content = None
+        if content is not None and use_cache:
+            fetched_bytes_cache.set(url, content)
+        future.set_result(content)
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        del state.pending_dict[url]
+
+    return content
+
+
+async def _afetch_bytes(
+    client: httpx.AsyncClient,
+    url: str,
+    timeout: Tuple[float, float],
+    max_bytes: int,
+) -> Optional[bytes]:
+    connect_timeout, read_timeout = timeout
+    try:
+        async with client.stream(
+            "GET",
+            url,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        ) as res:
+            if not res.is_success:
+                return None
+
+            content_length = res.headers.get("Content-Length", "")
+            if content_length.isdigit() and int(content_length) > max_bytes:
+                return None
+
+            chunk_list = []
+            received_bytes = 0
+            async for chunk in res.aiter_bytes(chunk_size=64 * 1024):
+                received_bytes += len(chunk)
+                if received_bytes > max_bytes:
+                    return None
+                chunk_list.append(chunk)
+    except httpx.HTTPError:
+        return None
+
+    return b"".join(chunk_list)
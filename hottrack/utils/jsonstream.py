@@ -0,0 +1,114 @@
+import gzip
+import io
+import json
+import os
+from typing import IO, Any, Iterator, List, TextIO
+from urllib.request import urlopen
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# 배열 원소인 숫자/true/false/null 값 뒤에 올 수 있는 문자
+SCALAR_DELIMITERS = frozenset(" \t\r\n,]")
+
+
+def open_text_stream(path_or_url: str) -> TextIO:
+    """로컬 파일 경로나 URL을 텍스트 스트림으로 엽니다. gzip 압축 여부는 자동으로 판단합니다."""
+
+    if os.path.exists(path_or_url):
+        stream: IO[bytes] = open(path_or_url, "rb")
+    else:
+        stream = urlopen(path_or_url)
+
+    # gzip 헤더를 확인하기 위해, 읽은 위치를 옮기지 않는 peek을 지원하도록 감쌉니다.
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+
+    return io.TextIOWrapper(stream, encoding="utf-8-sig")
+
+
+def iter_json_array(fp: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """최상위가 배열인 JSON을 전체를 읽지 않고, 원소 단위로 하나씩 반환합니다."""
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        """버퍼에 chunk_size 만큼 더 읽어들이고, 더 읽을 데이터가 없으면 False를 반환합니다."""
+        nonlocal buffer, pos, eof
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        # 이미 처리한 앞부분은 버려서 버퍼 크기를 유지합니다.
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_token() -> str:
+        """공백을 건너뛰고 다음 문자를 반환합니다. (읽은 위치는 옮기지 않음)"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                raise ValueError("JSON 배열이 끝나지 않았습니다.")
+
+    if next_token() != "[":
+        raise ValueError("최상위가 JSON 배열이 아닙니다.")
+    pos += 1
+
+    if next_token() == "]":
+        return
+
+    while True:
+        next_token()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+
+            # 숫자/true/false/null 은 버퍼 끝에서 잘린 앞부분만으로도 해석되므로 ("0.1" → "0"),
+            # 값 뒤에 구분 문자가 올 때까지 더 읽어서 다시 해석합니다.
+            if (
+                not isinstance(value, (list, dict, str))
+                and (end == len(buffer) or buffer[end] not in SCALAR_DELIMITERS)
+                and not eof
+                and fill()
+            ):
+                continue
+            break
+
+        pos = end
+        yield value
+
+        token = next_token()
+        pos += 1
+        if token == "]":
+            return
+        if token != ",":
+            raise ValueError(
+                f"JSON 배열 원소 사이에 잘못된 문자가 있습니다 : {token!r}"
+            )
+
+
+def iter_batches(iterable, batch_size: int) -> Iterator[List]:
+    """iterable을 batch_size 크기의 리스트로 나눕니다."""
+
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,8 +1,12 @@
+import asyncio
 import json
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+from typing import Dict, Iterable, Iterator, List, Optional
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+import httpx
 
 HEADERS = {
     "User-Agent": (
@@ -12,11 +16,22 @@ HEADERS = {
 }
 
 
+LIKES_URL = "https://www.melon.com/commonlike/getSongLike.json"
+
+# 너무 긴 URL은 서버에서 거부되므로, 이 길이를 넘지 않도록 곡 id 목록을 나눠 요청합니다.
+LIKES_MAX_URL_LENGTH = 2000
+
+# 좋아요 수 조회 요청의 타임아웃 (초)
+LIKES_TIMEOUT = 5
+
+
 # Song 모델의 melon_uid 필드는 문자열 타입이었고, 이를 id 정수 타입으로 변경
 
 
-def get_likes_dict(melon_uid_list: List[int]) -> Dict[int, int]:
-    url = "https://www.melon.com/commonlike/getSongLike.json"
+def get_likes_dict(
+    melon_uid_list: List[int], timeout: float = LIKES_TIMEOUT
+) -> Dict[int, int]:
+    url = LIKES_URL
     params = urlencode(
         {
             # 정수는 문자열로 변환해야만 join이 가능합니다.
@@ -27,7 +42,115 @@ def get_likes_dict(melon_uid_list: List[int]) -> Dict[int, int]:
     url_with_params = url + "?" + params
 
     request = Request(url_with_params, headers=HEADERS)
-    result = json.loads(urlopen(request).read())
+    result = json.loads(urlopen(request, timeout=timeout).read())
     likes_dict = {int(song["CONTSID"]): song["SUMMCNT"] for song in result["contsLike"]}
 
     return likes_dict
+
+
+def iter_melon_uid_chunks(
+    melon_uid_list: Iterable[int], max_url_length: int = LIKES_MAX_URL_LENGTH
+) -> Iterator[List[int]]:
+    """요청 URL이 max_url_length를 넘지 않도록 곡 id 목록을 나눕니다."""
+
+    base_length = len(LIKES_URL + "?" + urlencode({"contsIds": ""}))
+    comma_length = len(urlencode({"": ","})) - 1  # URL 인코딩된 쉼표 "%2C"
+
+    chunk: List[int] = []
+    url_length = base_length
+    for melon_uid in melon_uid_list:
+        uid_length = len(str(melon_uid)) + (comma_length if chunk else 0)
+        if chunk and url_length + uid_length > max_url_length:
+            yield chunk
+            chunk = []
+            url_length = base_length
+            uid_length = len(str(melon_uid))
+        chunk.append(melon_uid)
+        url_length += uid_length
+
+    if chunk:
+        yield chunk
+
+
+def get_likes_dict_concurrently(
+    melon_uid_list: Iterable[int],
+    max_workers: int = 4,
+    timeout: float = LIKES_TIMEOUT,
+) -> Dict[int, int]:
+    """곡 id 목록을 URL 길이 제한에 맞춰 나누고, 스레드 풀로 동시에 좋아요 수를 조회합니다.
+
+    일부 요청이 실패하더라도 성공한 요청의 결과는 반환합니다.
+    (실패한 곡 id는 반환값에 포함되지 않습니다.)
+    """
+
+    def fetch(chunk: List[int]) -> Optional[Dict[int, int]]:
+        try:
+            return get_likes_dict(chunk, timeout=timeout)
+        except (OSError, HTTPException, ValueError, KeyError):
+            # URLError/타임아웃 외에 urllib이 감싸지 않는 연결 끊김(RemoteDisconnected,
+            # ConnectionResetError)과 본문 중단(IncompleteRead)도 실패한 청크로 처리합니다.
+            return None
+
+    likes_dict: Dict[int, int] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_likes_dict in executor.map(
+            fetch, iter_melon_uid_chunks(melon_uid_list)
+        ):
+            if chunk_likes_dict is not None:
+                likes_dict.update(chunk_likes_dict)
+
+    return likes_dict
+
+
+async def aget_likes_dict(
+    client: httpx.AsyncClient,
+    melon_uid_list: List[int],
+    timeout: float = LIKES_TIMEOUT,
+) -> Dict[int, int]:
+    """get_likes_dict의 비동기 버전"""
+
+    res = await client.get(
+        LIKES_URL,
+        params={"contsIds": ",".join(map(str, melon_uid_list))},
+        headers=HEADERS,
+        timeout=timeout,
+    )
+    res.raise_for_status()
+    result = res.json()
+    return {int(song["CONTSID"]): song["SUMMCNT"] for song in result["contsLike"]}
+
+
+async def aget_likes_dict_concurrently(
+    melon_uid_list: Iterable[int],
+    max_concurrency: int = 4,
+    timeout: float = LIKES_TIMEOUT,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Dict[int, int]:
+    """get_likes_dict_concurrently의 비동기 버전. 스레드 대신 하나의 이벤트 루프에서 동시에 요청합니다.
+
+    동시 요청 수는 max_concurrency로 제한하며, 실패한 요청의 곡 id는 반환값에 포함되지 않습니다.
+    """
+
+    # 순환 참조를 피하기 위해 함수 안에서 임포트합니다. (http 모듈에서 HEADERS를 사용)
+    from .http import get_async_client
+
+    if client is None:
+        client = get_async_client()
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(chunk: List[int]) -> Optional[Dict[int, int]]:
+        async with semaphore:
+            try:
+                return await aget_likes_dict(client, chunk, timeout=timeout)
+            except (httpx.HTTPError, ValueError, KeyError):
+                return None
+
+    likes_dict: Dict[int, int] = {}
+    for chunk_likes_dict in await asyncio.gather(
+        *(fetch(chunk) for chunk in iter_melon_uid_chunks(melon_uid_list))
+    ):
+        if chunk_likes_dict is not None:
+            likes_dict.update(chunk_likes_dict)
+
+    return likes_dict
@@ -1,15 +1,26 @@
 import datetime
 import json
-from io import BytesIO
+from tempfile import TemporaryFile
 from typing import Literal
 from urllib.request import urlopen
 
-import pandas as pd
+from asgiref.sync import sync_to_async
 from django.conf import settings
-
-from django.db.models import QuerySet, Q
-from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
+from django.core.files.storage import default_storage
+
+from django.db.models import QuerySet
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render, get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django.views.generic import (
     DetailView,
     ListView,
@@ -21,15 +32,54 @@ from django.views.generic import (
     ArchiveIndexView,
     DateDetailView,
 )
+from django.views.generic.dates import timezone_today
+
+from hottrack.cache import get_song_card_version
+from hottrack.mixins import (
+    CursorPaginationMixin,
+    DateHistogramMixin,
+    QueryPlanMixin,
+    SearchQueryMixin,
+    SongConditionalGetMixin,
+)
+from hottrack.models import ChartEntry, ReleaseDateCount, Song
+from hottrack.utils.cover import (
+    aget_cached_cover,
+    get_cached_cover,
+    get_cover_etag,
+    render_cover_image,
+    snap_cover_size,
+)
+from hottrack.utils.export import iter_csv_lines, write_xlsx
+
 
-from hottrack.models import Song
-from hottrack.utils.cover import make_cover_image
+# 커버 이미지는 곡 정보가 바뀌면 ETag가 바뀌므로, 브라우저/CDN에서 오래 캐싱해도 됩니다.
+COVER_CACHE_MAX_AGE = 60 * 60 * 24
 
 
-class IndexView(ListView):
+class IndexView(
+    SongConditionalGetMixin,
+    QueryPlanMixin,
+    SearchQueryMixin,
+    CursorPaginationMixin,
+    ListView,
+):
     model = Song
     template_name = "hottrack/index.html"
     paginate_by = 10
+    cursor_count_mode = "estimated"
+    # _song.html 템플릿에서 사용하는 필드만 조회합니다. (가사 등 큰 필드 제외)
+    query_select_related = ("artist",)
+    query_only = (
+        "id",
+        "slug",
+        "rank",
+        "name",
+        "cover_url",
+        "release_date",
+        "like_count",
+        "artist__name",
+    )
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -38,19 +88,23 @@ class IndexView(ListView):
         if release_date:
             qs = qs.filter(release_date=release_date)
 
-        query = self.request.GET.get("query", "").strip()
-        if query:
-            qs = qs.filter(
-                Q(name__icontains=query)
-                | Q(artist__name__icontains=query)
-                | Q(album__name__icontains=query)
-            )
-
-        #
-        qs = qs.select_related("artist")
+        if self.query:
+            # search_vector 컬럼의 GIN 인덱스를 활용하여, 검색 순위 순으로 정렬합니다.
+            qs = qs.search(self.query)
 
         return qs
 
+    def get_context_data(self, **kwargs):
+        context_data = super().get_context_data(**kwargs)
+        context_data["song_card_version"] = get_song_card_version()
+        return context_data
+
+    def get_cursor_ordering(self):
+        # 검색 시에는 검색 순위, 아니면 차트 순위 순으로 정렬합니다.
+        if self.query:
+            return ("-search_rank", "rank", "id")
+        return ("rank", "id")
+
 
 index = IndexView.as_view()
 
@@ -79,8 +133,10 @@ index = IndexView.as_view()
 #     )
 
 
-class SongDetailView(DetailView):
+class SongDetailView(SongConditionalGetMixin, QueryPlanMixin, DetailView):
     model = Song
+    # song_detail.html 템플릿과 youtube_search_url 에서 앨범/가수명을 사용합니다.
+    query_select_related = ("artist", "album")
 
     # Song 모델에서 melon_uid 필드를 id 기본키로 변경했기에 melon_uid 인자 지원이 필요없어졌습니다.
 
@@ -89,23 +145,50 @@ song_detail = SongDetailView.as_view()
 
 
 def export(request, format: Literal["csv", "xlsx"]):
-    song_qs = Song.objects.all()
-    df = pd.DataFrame(data=song_qs.values())
+    song_qs: QuerySet[Song] = Song.objects.all()
+
+    # IndexView와 같은 검색 조건을 지원합니다.
+    release_date = request.GET.get("release_date", "").strip()
+    if release_date:
+        try:
+            song_qs = song_qs.filter(
+                release_date=datetime.date.fromisoformat(release_date)
+            )
+        except ValueError:
+            return HttpResponseBadRequest(f"Invalid release_date : {release_date}")
 
-    export_file = BytesIO()
+    query = request.GET.get("query", "").strip()
+    if query:
+        song_qs = song_qs.search(query)
+
+    # 검색용 컬럼을 제외한 모든 필드를 내보냅니다.
+    field_names = [
+        field.attname
+        for field in Song._meta.concrete_fields
+        if field.name != "search_vector"
+    ]
+
+    # 전체 행을 메모리에 올리지 않도록, 서버 측 커서로 chunk_size 만큼씩 조회합니다.
+    rows = song_qs.values_list(*field_names).iterator(chunk_size=2000)
 
     if format == "csv":
-        content_type = "text/csv"
         filename = "hottrack.csv"
-        df.to_csv(path_or_buf=export_file, index=False, encoding="utf-8-sig")
+        response = StreamingHttpResponse(
+            iter_csv_lines(field_names, rows), content_type="text/csv"
+        )
     elif format == "xlsx":
-        content_type = "application/vnd.ms-excel"
         filename = "hottrack.xlsx"
-        df.to_excel(excel_writer=export_file, index=False)
+        # xlsx는 zip 포맷이라 스트리밍으로 쓸 수 없기에, 임시 파일에 쓴 뒤 파일로 응답합니다.
+        export_file = TemporaryFile()
+        write_xlsx(field_names, rows, export_file)
+        export_file.seek(0)
+        response = FileResponse(
+            export_file,
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
     else:
         return HttpResponseBadRequest(f"Invalid format : {format}")
 
-    response = HttpResponse(content=export_file.getvalue(), content_type=content_type)
     response["Content-Disposition"] = 'attachment; filename="{}"'.format(filename)
 
     return response
@@ -113,46 +196,202 @@ def export(request, format: Literal["csv", "xlsx"]):
 
 def cover_png(request, pk):
     # 최대값 512, 기본값 256
-    canvas_size = min(512, int(request.GET.get("size", 256)))
-
-    song = get_object_or_404(Song, pk=pk)
+    # 미리 렌더링된 크기(COVER_SIZES) 중에 가장 가까운 크기로 맞춥니다.
+    canvas_size = snap_cover_size(min(512, int(request.GET.get("size", 256))))
 
-    cover_image = make_cover_image(
-        song.cover_url, song.artist.name, canvas_size=canvas_size
+    song = get_object_or_404(
+        Song.objects.select_related("artist").only("id", "cover_url", "artist__name"),
+        pk=pk,
     )
 
-    # param fp : filename (str), pathlib.Path object or file object
-    # image.save("image.png")
+    # ETag는 렌더링 없이 계산할 수 있으므로, 브라우저 캐시가 유효하면 곧바로 304 응답합니다.
+    etag = get_cover_etag(song.pk, canvas_size, song.cover_url, song.artist.name)
+    response = get_conditional_response(request, etag=quote_etag(etag))
+    if response is None:
+        # 렌더링된 이미지가 스토리지에 없을 때에만 렌더링합니다.
+        cached_cover = get_cached_cover(
+            song.pk, song.cover_url, song.artist.name, canvas_size=canvas_size
+        )
+        if cached_cover is None:
+            # 커버 이미지 다운로드에 실패했다면, 실패 이미지를 캐싱하지 않고 응답합니다.
+            return _render_uncached_cover_response(song.artist.name, canvas_size)
+
+        last_modified = int(cached_cover.last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=quote_etag(etag), last_modified=last_modified
+        )
+        if response is None:
+            try:
+                cover_file = default_storage.open(cached_cover.name)
+            except FileNotFoundError:
+                # 그 사이에 다른 요청이 파일을 교체했다면, 캐싱하지 않도록 응답합니다.
+                return _render_uncached_cover_response(song.artist.name, canvas_size)
+            response = FileResponse(cover_file, content_type="image/png")
+        response["Last-Modified"] = http_date(last_modified)
+
+    response["ETag"] = quote_etag(etag)
+    patch_cache_control(response, public=True, max_age=COVER_CACHE_MAX_AGE)
+
+    return response
+
+
+async def acover_png(request, pk):
+    """cover_png의 비동기 버전
+
+    ASGI 서버에서 커버 이미지를 받는 동안 스레드를 점유하지 않으므로,
+    하나의 프로세스에서 많은 수의 캐시 미스 요청을 동시에 처리할 수 있습니다.
+    """
+
+    canvas_size = snap_cover_size(min(512, int(request.GET.get("size", 256))))
+
+    try:
+        song = (
+            await Song.objects.select_related("artist")
+            .only("id", "cover_url", "artist__name")
+            .aget(pk=pk)
+        )
+    except Song.DoesNotExist:
+        raise Http404("No Song matches the given query.")
+
+    etag = get_cover_etag(song.pk, canvas_size, song.cover_url, song.artist.name)
+    response = get_conditional_response(request, etag=quote_etag(etag))
+    if response is None:
+        cached_cover = await aget_cached_cover(
+            song.pk, song.cover_url, song.artist.name, canvas_size=canvas_size
+        )
+        if cached_cover is None:
+            return await sync_to_async(
+                _render_uncached_cover_response, thread_sensitive=False
+            )(song.artist.name, canvas_size)
+
+        last_modified = int(cached_cover.last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=quote_etag(etag), last_modified=last_modified
+        )
+        if response is None:
+            # 렌더링된 커버 이미지는 작으므로, 스트리밍하지 않고 한 번에 읽어서 응답합니다.
+            try:
+                content = await sync_to_async(
+                    _read_storage_file, thread_sensitive=False
+                )(cached_cover.name)
+            except FileNotFoundError:
+                return await sync_to_async(
+                    _render_uncached_cover_response, thread_sensitive=False
+                )(song.artist.name, canvas_size)
+            response = HttpResponse(content, content_type="image/png")
+        response["Last-Modified"] = http_date(last_modified)
+
+    response["ETag"] = quote_etag(etag)
+    patch_cache_control(response, public=True, max_age=COVER_CACHE_MAX_AGE)
+
+    return response
+
+
+def _render_uncached_cover_response(text: str, canvas_size: int) -> HttpResponse:
+    """렌더링된 커버 이미지를 사용할 수 없을 때, 실패 이미지를 캐싱하지 않도록 응답합니다."""
+
+    cover_image = render_cover_image(None, text, canvas_size=canvas_size)
     response = HttpResponse(content_type="image/png")
     cover_image.save(response, format="png")
-
+    patch_cache_control(response, no_cache=True)
     return response
 
 
-class SongYearArchiveView(YearArchiveView):
+def _read_storage_file(name: str) -> bytes:
+    with default_storage.open(name) as f:
+        return f.read()
+
+
+def song_rank_history(request, pk):
+    """곡의 차트 일자별 순위/좋아요 수 시계열을 JSON으로 응답합니다."""
+
+    song = get_object_or_404(Song.objects.only("id", "name"), pk=pk)
+
+    # (song, chart_date) 유일 제약의 인덱스로 조회/정렬합니다.
+    chart_entry_qs = ChartEntry.objects.filter(song=song).order_by("chart_date")
+
+    try:
+        since = request.GET.get("since", "").strip()
+        if since:
+            chart_entry_qs = chart_entry_qs.filter(
+                chart_date__gte=datetime.date.fromisoformat(since)
+            )
+
+        until = request.GET.get("until", "").strip()
+        if until:
+            chart_entry_qs = chart_entry_qs.filter(
+                chart_date__lte=datetime.date.fromisoformat(until)
+            )
+    except ValueError:
+        return HttpResponseBadRequest(
+            "since/until 인자는 YYYY-MM-DD 포맷이어야 합니다."
+        )
+
+    rank_list = [
+        {"chart_date": chart_date, "rank": rank, "like_count": like_count}
+        for chart_date, rank, like_count in chart_entry_qs.values_list(
+            "chart_date", "rank", "like_count"
+        )
+    ]
+
+    return JsonResponse(
+        {
+            "song": {"id": song.id, "name": song.name},
+            "rank_list": rank_list,
+        }
+    )
+
+
+# 아카이브 템플릿에서는 곡명과 발매일만 출력합니다.
+SONG_ARCHIVE_ONLY_FIELDS = ("id", "name", "release_date")
+
+
+class SongYearArchiveView(
+    SongConditionalGetMixin, QueryPlanMixin, DateHistogramMixin, YearArchiveView
+):
     model = Song
+    histogram_model = ReleaseDateCount
+    query_only = SONG_ARCHIVE_ONLY_FIELDS
     date_field = "release_date"  # 조회할 날짜 필드
     make_object_list = True
 
 
-class SongMonthArchiveView(MonthArchiveView):
+class SongMonthArchiveView(
+    SongConditionalGetMixin, QueryPlanMixin, DateHistogramMixin, MonthArchiveView
+):
     model = Song
+    histogram_model = ReleaseDateCount
+    query_only = SONG_ARCHIVE_ONLY_FIELDS
     # paginate_by = None
     date_field = "release_date"
     # 날짜 포맷 : "%m" (숫자, ex: "01", "1" 등), "%b" (디폴트, 월 이름의 약어, ex: "Jan", "Feb" 등)
     month_format = "%m"
 
 
-class SongDayArchiveView(DayArchiveView):
+class SongDayArchiveView(
+    SongConditionalGetMixin, QueryPlanMixin, DateHistogramMixin, DayArchiveView
+):
     model = Song
+    histogram_model = ReleaseDateCount
+    query_only = SONG_ARCHIVE_ONLY_FIELDS
     date_field = "release_date"
     month_format = "%m"
 
 
-class SongTodayArchiveView(TodayArchiveView):
+class SongTodayArchiveView(
+    SongConditionalGetMixin, QueryPlanMixin, DateHistogramMixin, TodayArchiveView
+):
     model = Song
+    histogram_model = ReleaseDateCount
+    query_only = SONG_ARCHIVE_ONLY_FIELDS
     date_field = "release_date"
 
+    # 데이터 변경이 없어도 날짜가 바뀌면 목록이 바뀌므로, 오늘 0시를 함께 반영합니다.
+    def get_last_modified(self):
+        today = timezone_today()
+        midnight = datetime.datetime.combine(today, datetime.time()).timestamp()
+        return max(super().get_last_modified(), int(midnight))
+
     if settings.DEBUG:
 
         def get_dated_items(self):
@@ -166,8 +405,12 @@ class SongTodayArchiveView(TodayArchiveView):
                 return super().get_dated_items()
 
 
-class SongWeekArchiveView(WeekArchiveView):
+class SongWeekArchiveView(
+    SongConditionalGetMixin, QueryPlanMixin, DateHistogramMixin, WeekArchiveView
+):
     model = Song
+    histogram_model = ReleaseDateCount
+    query_only = SONG_ARCHIVE_ONLY_FIELDS
     date_field = "release_date"
     # date_list_period = "week"
     # 템플릿 필터 date의 "W" 포맷은 ISO 8601에 따라 한 주의 시작을 월요일로 간주합니다.
@@ -177,11 +420,20 @@ class SongWeekArchiveView(WeekArchiveView):
     )
 
 
-class SongArchiveIndexView(ArchiveIndexView):
+class SongArchiveIndexView(
+    SongConditionalGetMixin,
+    QueryPlanMixin,
+    DateHistogramMixin,
+    CursorPaginationMixin,
+    ArchiveIndexView,
+):
     model = Song
+    histogram_model = ReleaseDateCount
+    query_only = SONG_ARCHIVE_ONLY_FIELDS
     # queryset = Song.objects.all()
     date_field = "release_date"  # 기준 날짜 필드
     paginate_by = 10  # 페이지 당 출력할 객체 수
+    cursor_ordering = ("-release_date", "-id")
 
     # date_list_period = "year"  # 단위 : year (디폴트), month, day, week
     def get_date_list_period(self):
@@ -194,7 +446,8 @@ class SongArchiveIndexView(ArchiveIndexView):
         return context_data
 
 
-class SongDateDetailView(DateDetailView):
+class SongDateDetailView(SongConditionalGetMixin, QueryPlanMixin, DateDetailView):
     model = Song
+    query_select_related = ("artist", "album")
     date_field = "release_date"
     month_format = "%m"
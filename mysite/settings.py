@@ -143,6 +143,12 @@ DATABASES = {
     }
 }
 
+# 관리 명령(load_melon_songs 등)에서 무효화한 캐시를 웹 서버 프로세스에서도 알 수 있도록,
+# 운영 환경에서는 프로세스 간에 공유되는 캐시를 지정해주세요. (ex: CACHE_URL=redis://localhost:6379/0)
+CACHES = {
+    "default": env.cache_url("CACHE_URL", default="locmemcache://"),
+}
+
 AUTH_USER_MODEL = "accounts.User"
 
 # Password validation
@@ -212,6 +218,11 @@ if DEBUG:
         "debug_toolbar.middleware.DebugToolbarMiddleware",
     ] + MIDDLEWARE
 
+# 테스트 실행 시에는 DEBUG=False 가 되어 툴바가 표시되지 않으므로, 설치 여부 검사를 끕니다.
+DEBUG_TOOLBAR_CONFIG = {
+    "IS_RUNNING_TESTS": False,
+}
+
 
 INTERNAL_IPS = ["127.0.0.1"]
 ADMIN_PREFIX = "secret-admin/"
@@ -219,6 +230,11 @@ ADMIN_PREFIX = "secret-admin/"
 
 NAVER_MAP_POINT_WIDGET_CLIENT_ID = env.str("NAVER_MAP_POINT_WIDGET_CLIENT_ID")
 
+# ASGI 서버(mysite.asgi)로 실행할 때, hottrack 의 네트워크 I/O 뷰를 비동기 버전으로 연결합니다.
+# DEBUG 모드에서는 동기 전용인 DebugToolbarMiddleware 로 인해 비동기 뷰도 한 번에 하나씩 실행되므로,
+# 동시 처리 성능은 DEBUG=False 에서 확인해주세요.
+HOTTRACK_ASYNC_VIEWS = env.bool("HOTTRACK_ASYNC_VIEWS", default=False)
+
 # LOGIN_REDIRECT_URL = "/accounts/profile/"
 LOGIN_REDIRECT_URL = reverse_lazy("accounts:profile")
 LOGIN_URL = reverse_lazy("accounts:login")
@@ -0,0 +1,32 @@
+# mysite/settings_bench.py
+
+"""bench_hottrack 명령 전용 설정
+
+측정용 데이터를 생성/삭제하고 캐시를 무효화하므로, 개발/운영 데이터베이스와 캐시를 건드리지 않도록
+별도의 데이터베이스와 캐시 키 네임스페이스를 사용합니다.
+
+    createdb -O myuser mydb_bench
+    python manage.py migrate --settings=mysite.settings_bench
+    python manage.py bench_hottrack --settings=mysite.settings_bench
+"""
+
+from mysite.settings import *  # noqa: F401, F403
+from mysite.settings import CACHES, DATABASES, env
+
+
+# bench_hottrack 명령은 이 값이 켜져 있을 때에만 실행됩니다.
+HOTTRACK_BENCHMARK = True
+
+DATABASES = {
+    **DATABASES,
+    "default": {
+        **DATABASES["default"],
+        "NAME": env.str("BENCH_DATABASE_NAME", default="mydb_bench"),
+    },
+}
+
+# 캐시 서버를 함께 사용하더라도, 측정 중의 캐시 무효화가 다른 프로세스에 영향을 주지 않도록 합니다.
+CACHES = {
+    alias: {**cache_config, "KEY_PREFIX": "hottrack-bench"}
+    for alias, cache_config in CACHES.items()
+}